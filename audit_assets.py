@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+LumiChat Asset Auditor
+Reports bundle size, decoded memory cost, duplicates and unreferenced assets
+"""
+
+from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import hashlib
+import json
+import os
+import re
+
+ASSET_DIRS = ["assets/images", "assets/icons", "assets/animations", "assets/sounds"]
+SOURCE_DIRS = ["lib"]
+CACHE_PATH = ".asset_audit_cache.json"
+
+# Default budgets (bytes)
+DEFAULT_MAX_APK_BYTES = 8 * 1024 * 1024
+DEFAULT_MAX_DECODED_BYTES = 48 * 1024 * 1024
+
+# Perceptual hashes closer than this (in bits) count as near-duplicates
+NEAR_DUPLICATE_DISTANCE = 4
+
+def list_assets(asset_dirs=ASSET_DIRS):
+    """List every bundled asset file, sorted for stable output"""
+    assets = []
+    for asset_dir in asset_dirs:
+        if not os.path.isdir(asset_dir):
+            continue
+        for root, _, files in os.walk(asset_dir):
+            for name in files:
+                assets.append(os.path.join(root, name).replace(os.sep, "/"))
+    return sorted(assets)
+
+def difference_hash(img, hash_size=8):
+    """Compute a 64-bit perceptual dHash of an image"""
+    # Flatten alpha onto white so transparent padding doesn't dominate
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        flat = Image.new("RGBA", img.size, (255, 255, 255, 255))
+        img = Image.alpha_composite(flat, img)
+    gray = img.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    pixels = gray.tobytes()
+
+    value = 0
+    for y in range(hash_size):
+        for x in range(hash_size):
+            left = pixels[y * (hash_size + 1) + x]
+            right = pixels[y * (hash_size + 1) + x + 1]
+            value = (value << 1) | (left > right)
+    return f"{value:016x}"
+
+def hamming_distance(hash_a, hash_b):
+    """Number of differing bits between two hex hashes"""
+    return bin(int(hash_a, 16) ^ int(hash_b, 16)).count("1")
+
+def inspect_asset(path):
+    """Hash and measure a single asset"""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    info = {
+        "bytes": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "width": None,
+        "height": None,
+        "decoded_bytes": 0,
+        "phash": None,
+    }
+
+    try:
+        with Image.open(path) as img:
+            info["width"], info["height"] = img.size
+            # Draft mode lets JPEGs decode at reduced scale for hashing
+            img.draft("RGB", (64, 64))
+            info["decoded_bytes"] = info["width"] * info["height"] * 4  # RGBA8888
+            info["phash"] = difference_hash(img)
+    except (OSError, Image.DecompressionBombError):
+        # Not a raster Pillow understands (SVG, JSON, audio...)
+        pass
+
+    return info
+
+def load_cache(cache_path=CACHE_PATH):
+    """Load the hash cache from disk"""
+    if not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache, cache_path=CACHE_PATH):
+    """Persist the hash cache"""
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+
+def scan_assets(assets, cache, workers=None):
+    """Inspect assets in parallel, reusing cached entries whose mtime and size match"""
+    results = {}
+    pending = []
+
+    for path in assets:
+        stat = os.stat(path)
+        key = [stat.st_mtime_ns, stat.st_size]
+        entry = cache.get(path)
+        if entry and entry.get("key") == key:
+            results[path] = entry["info"]
+        else:
+            pending.append((path, key))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        inspected = pool.map(lambda item: inspect_asset(item[0]), pending)
+        for (path, key), info in zip(pending, inspected):
+            results[path] = info
+            cache[path] = {"key": key, "info": info}
+
+    # Drop entries for assets that no longer exist
+    for path in list(cache):
+        if path not in results:
+            del cache[path]
+
+    return results, len(pending)
+
+def find_exact_duplicates(results):
+    """Group assets with identical content"""
+    groups = {}
+    for path, info in results.items():
+        groups.setdefault(info["sha256"], []).append(path)
+    return [sorted(paths) for paths in groups.values() if len(paths) > 1]
+
+def find_near_duplicates(results, max_distance=NEAR_DUPLICATE_DISTANCE):
+    """Cluster visually similar rasters (size variants of one design end up together)
+
+    Clusters are the connected components of "within max_distance" over all
+    pairs, so they do not depend on the order assets are visited in.
+    """
+    hashed = sorted(path for path, info in results.items() if info["phash"])
+    parent = {path: path for path in hashed}
+
+    def find(path):
+        while parent[path] != path:
+            parent[path] = parent[parent[path]]
+            path = parent[path]
+        return path
+
+    for index, path in enumerate(hashed):
+        for other in hashed[index + 1:]:
+            if hamming_distance(results[path]["phash"], results[other]["phash"]) <= max_distance:
+                root, other_root = find(path), find(other)
+                if root != other_root:
+                    parent[max(root, other_root)] = min(root, other_root)
+
+    clusters = {}
+    for path in hashed:
+        clusters.setdefault(find(path), []).append(path)
+
+    # Byte-identical groups are already reported as exact duplicates
+    return [cluster for cluster in clusters.values()
+            if len({results[path]["sha256"] for path in cluster}) > 1]
+
+def find_unreferenced(assets, source_dirs=SOURCE_DIRS):
+    """Find assets whose path never appears in a Dart source file
+
+    Returns (unreferenced, possibly_referenced). A reference built by
+    interpolation, like 'assets/images/$name.png', only matches up to the
+    interpolation; assets under such a prefix are possibly referenced rather
+    than dead.
+    """
+    sources = []
+    for source_dir in source_dirs:
+        for root, _, files in os.walk(source_dir):
+            for name in files:
+                if name.endswith(".dart"):
+                    with open(os.path.join(root, name), "r", encoding="utf-8", errors="ignore") as f:
+                        sources.append(f.read())
+    text = "\n".join(sources)
+
+    referenced = set(re.findall(r"assets/[\w\-./]+", text))
+    prefixes = referenced - set(assets)
+    unreferenced, possibly_referenced = [], []
+    for path in assets:
+        if path in referenced:
+            continue
+        if any(path.startswith(prefix) for prefix in prefixes):
+            possibly_referenced.append(path)
+        else:
+            unreferenced.append(path)
+    return unreferenced, possibly_referenced
+
+def format_bytes(count):
+    """Human readable byte count"""
+    for unit in ("B", "KB", "MB"):
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GB"
+
+def audit(max_apk_bytes=DEFAULT_MAX_APK_BYTES, max_decoded_bytes=DEFAULT_MAX_DECODED_BYTES,
+          cache_path=CACHE_PATH, workers=None):
+    """Run the full audit and return a report dict"""
+    assets = list_assets()
+    cache = load_cache(cache_path)
+    results, rescanned = scan_assets(assets, cache, workers)
+    save_cache(cache, cache_path)
+
+    total_bytes = sum(info["bytes"] for info in results.values())
+    total_decoded = sum(info["decoded_bytes"] for info in results.values())
+    unreferenced, possibly_referenced = find_unreferenced(assets)
+
+    return {
+        "assets": results,
+        "rescanned": rescanned,
+        "total_bytes": total_bytes,
+        "total_decoded_bytes": total_decoded,
+        "exact_duplicates": find_exact_duplicates(results),
+        "near_duplicates": find_near_duplicates(results),
+        "unreferenced": unreferenced,
+        "possibly_referenced": possibly_referenced,
+        "over_apk_budget": total_bytes > max_apk_bytes,
+        "over_decoded_budget": total_decoded > max_decoded_bytes,
+    }
+
+def print_report(report, max_apk_bytes, max_decoded_bytes):
+    """Print the audit report"""
+    print(f"{'Asset':<48} {'File':>10} {'Decoded':>10}  Size")
+    print("-" * 84)
+    for path, info in sorted(report["assets"].items(), key=lambda item: -item[1]["decoded_bytes"]):
+        dims = f"{info['width']}x{info['height']}" if info["width"] else "-"
+        decoded = format_bytes(info["decoded_bytes"]) if info["decoded_bytes"] else "-"
+        print(f"{path:<48} {format_bytes(info['bytes']):>10} {decoded:>10}  {dims}")
+
+    print()
+    print(f"📦 Bundle size:    {format_bytes(report['total_bytes'])} (budget {format_bytes(max_apk_bytes)})")
+    print(f"🧠 Decoded memory: {format_bytes(report['total_decoded_bytes'])} (budget {format_bytes(max_decoded_bytes)})")
+    print(f"♻️  Rescanned {report['rescanned']} of {len(report['assets'])} assets (rest from cache)")
+
+    if report["exact_duplicates"]:
+        print("\n🔁 Exact duplicates:")
+        for group in report["exact_duplicates"]:
+            print("   • " + " == ".join(group))
+
+    if report["near_duplicates"]:
+        print("\n👯 Near duplicates:")
+        for cluster in report["near_duplicates"]:
+            print("   • " + " ~ ".join(cluster))
+
+    if report["unreferenced"]:
+        print("\n🗑️  Not referenced from lib/:")
+        for path in report["unreferenced"]:
+            print(f"   • {path}")
+
+    if report["possibly_referenced"]:
+        print("\n❔ Possibly referenced through an interpolated path:")
+        for path in report["possibly_referenced"]:
+            print(f"   • {path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit bundled LumiChat assets")
+    parser.add_argument("--max-apk-bytes", type=int, default=DEFAULT_MAX_APK_BYTES,
+                        help="fail if bundled asset bytes exceed this")
+    parser.add_argument("--max-decoded-bytes", type=int, default=DEFAULT_MAX_DECODED_BYTES,
+                        help="fail if decoded RGBA memory exceeds this")
+    parser.add_argument("--cache", default=CACHE_PATH, help="hash cache file")
+    parser.add_argument("--workers", type=int, default=None, help="parallel scan workers")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = audit(args.max_apk_bytes, args.max_decoded_bytes, args.cache, args.workers)
+
+    if args.json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+    else:
+        print("🔍 LumiChat Asset Audit")
+        print("=" * 50)
+        print_report(report, args.max_apk_bytes, args.max_decoded_bytes)
+
+    if report["over_apk_budget"] or report["over_decoded_budget"]:
+        print("\n❌ Asset budget exceeded")
+        return 1
+
+    print("\n✅ Within asset budget")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
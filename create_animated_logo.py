@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+LumiChat Animated Logo Creator
+Renders the premium logo as a looping frame sequence (glow pulse, ray rotation, spark twinkle)
+Exports APNG, animated WebP and the Lottie JSON the app plays (AppImages.logoAnimated)
+
+The Lottie file embeds the static logo once and animates the spark as vector
+shapes with keyframed rotation, opacity and scale.
+"""
+
+from create_premium_logo_v2 import (PREMIUM_COLORS, RAY_ANGLES, create_premium_lumichat_logo, draw_lumi_spark,
+                                    draw_premium_highlights, lumi_center, premium_bubble_box)
+from layer_cache import LAYER_CACHE
+from logo_canvas import RasterCanvas
+from pixel_buffer import COPY_TRACKER, as_image
+import argparse
+import base64
+import io
+import json
+import math
+import os
+import time
+
+OUTPUT_DIR = "assets/animations"
+OUTPUT_NAME = "logo_animation"
+
+# Rays have 8-way symmetry, so turning them 45 degrees loops seamlessly
+RAY_LOOP_DEGREES = 45
+
+def frame_params(index, frame_count):
+    """Glow, ray rotation and twinkle for one frame of the loop"""
+    phase = index / frame_count
+    wave = math.sin(2 * math.pi * phase)
+    return {
+        "glow": 1.0 + 0.3 * wave,
+        "rotation": RAY_LOOP_DEGREES * phase,
+        # Twinkle runs twice per loop, offset from the glow pulse
+        "twinkle": 1.1 + 0.5 * math.sin(4 * math.pi * phase + math.pi / 2),
+    }
+
+def iter_logo_frames(size=512, frame_count=48, timings=None):
+    """Lazily render animation frames as (target_name, image, metadata)
+
+    The background, bubble and shadows are rendered once; each frame copies
+    them and draws the spark, rays and highlights onto the copy, exactly as
+    the static logo does.
+    """
+    start = time.perf_counter()
+    static = create_premium_lumichat_logo(size, include_lumi=False)
+    if timings is not None:
+        timings["static"] = time.perf_counter() - start
+        timings.setdefault("frames", [])
+
+    for index in range(frame_count):
+        start = time.perf_counter()
+        params = frame_params(index, frame_count)
+
+        frame = static.copy("frame")
+        canvas = RasterCanvas(frame)
+        draw_lumi_spark(canvas, size, **params)
+        draw_premium_highlights(canvas, size)
+
+        if timings is not None:
+            timings["frames"].append(time.perf_counter() - start)
+
+        yield f"{OUTPUT_NAME}_{index:03d}.png", frame, {"index": index, **params}
+
+def save_apng(frames, path, fps):
+    """Save frames as a looping animated PNG"""
+    frames[0].save(path, "PNG", save_all=True, append_images=frames[1:],
+                   duration=int(1000 / fps), loop=0, disposal=1, optimize=True)
+
+def save_webp(frames, path, fps, quality=90):
+    """Save frames as a looping animated WebP"""
+    frames[0].save(path, "WEBP", save_all=True, append_images=frames[1:],
+                   duration=int(1000 / fps), loop=0, quality=quality, method=4)
+
+def _lottie_value(value):
+    """Static Lottie property"""
+    return {"a": 0, "k": value}
+
+def _lottie_keyframes(values):
+    """Animated Lottie property, linear between one keyframe per frame"""
+    linear = {"i": {"x": [1], "y": [1]}, "o": {"x": [0], "y": [0]}}
+    return {"a": 1, "k": [{"t": frame, "s": value, **linear} for frame, value in enumerate(values)]}
+
+def _lottie_color(rgb):
+    """Static Lottie color from 0-255 RGB"""
+    return _lottie_value([channel / 255 for channel in rgb] + [1])
+
+def _lottie_group(name, items, anchor=(0, 0), rotation=None, scale=None):
+    """Shape group; rotation and scale (animated properties) turn about anchor"""
+    transform = {
+        "ty": "tr",
+        "p": _lottie_value(list(anchor)),
+        "a": _lottie_value(list(anchor)),
+        "s": scale or _lottie_value([100, 100]),
+        "r": rotation or _lottie_value(0),
+        "o": _lottie_value(100),
+    }
+    return {"ty": "gr", "nm": name, "it": items + [transform]}
+
+def _lottie_layer_transform():
+    """Identity layer transform"""
+    return {
+        "o": _lottie_value(100),
+        "r": _lottie_value(0),
+        "p": _lottie_value([0, 0, 0]),
+        "a": _lottie_value([0, 0, 0]),
+        "s": _lottie_value([100, 100, 100]),
+    }
+
+def _lottie_circle(center, radius):
+    # PIL ellipses cover both corners of their box, one pixel wider than 2 * radius
+    return {"ty": "el", "p": _lottie_value([center[0] + 0.5, center[1] + 0.5]),
+            "s": _lottie_value([2 * radius + 1, 2 * radius + 1])}
+
+def lottie_spark_shapes(size, params, colors=PREMIUM_COLORS, rays=RAY_ANGLES):
+    """The spark and rays of draw_lumi_spark as Lottie shapes, top-most first
+
+    params is frame_params for every frame; glow, twinkle and rotation become
+    keyframed opacity, scale and rotation.
+    """
+    bubble_width = premium_bubble_box(size)[2]
+    center = lumi_center(size)
+    spark_radius = max(4, size // 160)
+
+    # Rays: 4px bars whose opacity ramps up towards the tip. The raster's stepped
+    # lines overwrite each other into a bar averaging alpha ~107 by the spark and 180 at the tip
+    ray_length = bubble_width // 5
+    accent = [channel / 255 for channel in colors['accent']]
+    ray_shapes = []
+    for angle in rays:
+        angle_rad = math.radians(angle)
+        dx, dy = math.cos(angle_rad), math.sin(angle_rad)
+        tip = [center[0] + ray_length * dx, center[1] + ray_length * dy]
+        points = [[center[0] - dy * 2, center[1] + dx * 2], [tip[0] - dy * 2, tip[1] + dx * 2],
+                  [tip[0] + dy * 2, tip[1] - dx * 2], [center[0] + dy * 2, center[1] - dx * 2]]
+        ray_shapes.append(_lottie_group(f"ray {angle}", [
+            {"ty": "sh", "ks": _lottie_value({"c": True, "v": points,
+                                               "i": [[0, 0]] * 4, "o": [[0, 0]] * 4})},
+            {"ty": "gf", "t": 1, "o": _lottie_value(100), "r": 1,
+             "s": _lottie_value(list(center)), "e": _lottie_value(tip),
+             # Color stops, then opacity stops
+             "g": {"p": 2, "k": _lottie_value([0, *accent, 1, *accent, 0, round(107 / 255, 4),
+                                               1, round(180 / 255, 4)])}},
+        ]))
+    ray_rotation = _lottie_keyframes([[p["rotation"]] for p in params] + [[RAY_LOOP_DEGREES]])
+    shapes = [_lottie_group("rays", ray_shapes, center, rotation=ray_rotation)]
+
+    # Inner highlight, scaled by twinkle in the same whole-pixel steps as the raster
+    base_inner = max(2, spark_radius // 2)
+    inner_scale = [[100 * max(2, int(spark_radius // 2 * p["twinkle"])) / base_inner] * 2 for p in params]
+    shapes.append(_lottie_group("highlight", [
+        _lottie_circle(center, base_inner),
+        {"ty": "fl", "c": _lottie_color(colors['white']), "o": _lottie_value(100), "r": 1},
+    ], center, scale=_lottie_keyframes(inner_scale + [inner_scale[0]])))
+
+    shapes.append(_lottie_group("spark", [
+        _lottie_circle(center, spark_radius),
+        {"ty": "fl", "c": _lottie_color(colors['secondary']), "o": _lottie_value(100), "r": 1},
+    ]))
+
+    # Glow rings: each a one-pixel annulus (even-odd fill) whose opacity follows glow
+    for i in range(1, 7):
+        opacity = [[min(255, int((200 - i * 25) * p["glow"])) / 255 * 100] for p in params]
+        shapes.append(_lottie_group(f"glow {i}", [
+            _lottie_circle(center, spark_radius + i),
+            _lottie_circle(center, spark_radius + i - 1),
+            {"ty": "fl", "c": _lottie_color(colors['accent']),
+             "o": _lottie_keyframes(opacity + [opacity[0]]), "r": 2},
+        ]))
+    return shapes
+
+def save_lottie(path, fps, size, frame_count):
+    """Save the animation as Lottie: the static logo as one image, the spark as animated shapes"""
+    static = create_premium_lumichat_logo(size, include_lumi=False)
+    draw_premium_highlights(RasterCanvas(static), size)
+    buffer = io.BytesIO()
+    as_image(static).save(buffer, "PNG", optimize=True)
+    params = [frame_params(index, frame_count) for index in range(frame_count)]
+
+    common = {"ddd": 0, "sr": 1, "ao": 0, "ip": 0, "op": frame_count, "st": 0, "bm": 0}
+    animation = {
+        "v": "5.7.4",
+        "fr": fps,
+        "ip": 0,
+        "op": frame_count,
+        "w": size,
+        "h": size,
+        "nm": OUTPUT_NAME,
+        "ddd": 0,
+        "assets": [{
+            "id": "static",
+            "w": size,
+            "h": size,
+            "u": "",
+            "p": "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode("ascii"),
+            "e": 1,
+        }],
+        # Layers are listed top-most first
+        "layers": [
+            {"ind": 1, "ty": 4, "nm": "spark", "ks": _lottie_layer_transform(),
+             "shapes": lottie_spark_shapes(size, params), **common},
+            {"ind": 2, "ty": 2, "nm": "static", "refId": "static", "ks": _lottie_layer_transform(), **common},
+        ],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(animation, f, separators=(",", ":"))
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the animated LumiChat logo")
+    parser.add_argument("--size", type=int, default=512)
+    parser.add_argument("--frames", type=int, default=48)
+    parser.add_argument("--fps", type=int, default=24)
+    parser.add_argument("--out-dir", default=OUTPUT_DIR)
+    parser.add_argument("--no-lottie", action="store_true", help="skip the Lottie JSON")
+    args = parser.parse_args()
+
+    print("🎬 LumiChat Animated Logo Creator")
+    print(f"   {args.frames} frames @ {args.fps} fps, {args.size}x{args.size}")
+    print()
+
+    timings = {}
+    frames = [as_image(frame) for _, frame, _ in iter_logo_frames(args.size, args.frames, timings)]
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    base = os.path.join(args.out_dir, OUTPUT_NAME)
+
+    save_apng(frames, base + ".png", args.fps)
+    print(f"✓ APNG: {base}.png")
+    save_webp(frames, base + ".webp", args.fps)
+    print(f"✓ WebP: {base}.webp")
+    if not args.no_lottie:
+        save_lottie(base + ".json", args.fps, args.size, args.frames)
+        print(f"✓ Lottie: {base}.json")
+
+    frame_times = sorted(timings["frames"])
+    print()
+    print(f"⏱️  Static layers (once): {timings['static'] * 1000:.1f} ms")
+    print(f"⏱️  Per frame: {sum(frame_times) / len(frame_times) * 1000:.2f} ms avg, "
+          f"{frame_times[len(frame_times) // 2] * 1000:.2f} ms median")
+    print(f"🧱 {LAYER_CACHE.summary()}")
+    if COPY_TRACKER.enabled:
+        print(f"📋 {COPY_TRACKER.summary()}")
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ LumiChat Logo Creator
 Creates a modern, professional HD logo for the LumiChat AI messaging app
 """
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import numpy as np
 import math
 
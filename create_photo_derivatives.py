@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+LumiChat Photo Derivative Builder
+Pre-generates thumbnail and display sizes for profile and chat photos
+Reuses the logo pipeline's LANCZOS resize and encode stages
+"""
+
+from PIL import Image, ImageOps
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from render_pipeline import encode, to_working_mode
+import argparse
+import json
+import os
+import random
+import time
+
+PHOTO_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+MANIFEST_NAME = ".derivatives_manifest.jsonl"
+
+# Derivative name -> longest side in pixels
+DERIVATIVE_SIZES = {
+    "thumb": 150,
+    "small": 320,
+    "display": 720,
+    "large": 1280,
+}
+
+FORMAT_SETTINGS = {
+    "webp": {"format": "WEBP", "save_args": {"quality": 82, "method": 4}},
+    "jpeg": {"format": "JPEG", "save_args": {"quality": 85, "optimize": True, "progressive": True}},
+}
+
+STAGES = ("decode", "orient", "resize", "encode", "write")
+
+def list_photos(source_dir):
+    """List photos under source_dir as paths relative to it"""
+    photos = []
+    for root, _, files in os.walk(source_dir):
+        for name in files:
+            if name.lower().endswith(PHOTO_EXTENSIONS):
+                photos.append(os.path.relpath(os.path.join(root, name), source_dir))
+    return sorted(photos)
+
+def fit_within(size, longest_side):
+    """Scale (width, height) so the longest side is at most longest_side"""
+    width, height = size
+    scale = min(1.0, longest_side / max(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def build_derivatives(source_dir, rel_path, out_dir, sizes, formats):
+    """Decode one photo and write every derivative; returns outputs and stage timings"""
+    timings = dict.fromkeys(STAGES, 0.0)
+    outputs = []
+
+    start = time.perf_counter()
+    img = Image.open(os.path.join(source_dir, rel_path))
+    # JPEG draft mode decodes straight to a 1/2, 1/4 or 1/8 scale
+    largest = max(sizes.values())
+    img.draft("RGB", (largest, largest))
+    img.load()
+    timings["decode"] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    # Draft size is pre-rotation; long side stays the long side after transpose
+    img = ImageOps.exif_transpose(img)
+    img = to_working_mode(img)
+    timings["orient"] += time.perf_counter() - start
+
+    stem = os.path.splitext(rel_path)[0]
+    derivative = img
+    for name, longest_side in sorted(sizes.items(), key=lambda item: -item[1]):
+        start = time.perf_counter()
+        # Largest first, each size resized from the previous one
+        target_size = fit_within(derivative.size, longest_side)
+        derivative = derivative.resize(target_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+        timings["resize"] += time.perf_counter() - start
+
+        for fmt in formats:
+            settings = FORMAT_SETTINGS[fmt]
+            start = time.perf_counter()
+            image = derivative.convert("RGB") if settings["format"] == "JPEG" else derivative
+            data = encode(image, settings)
+            timings["encode"] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            target_name = f"{stem}_{name}.{'jpg' if fmt == 'jpeg' else fmt}"
+            path = os.path.join(out_dir, target_name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+            timings["write"] += time.perf_counter() - start
+            outputs.append(target_name)
+
+    return rel_path, outputs, timings
+
+def source_key(source_dir, rel_path):
+    """Change-detection key for a source photo"""
+    stat = os.stat(os.path.join(source_dir, rel_path))
+    return [stat.st_mtime_ns, stat.st_size]
+
+def load_manifest(out_dir):
+    """Read completed photos from the progress manifest"""
+    done = {}
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Torn final line from an interrupted run
+                continue
+            done[entry["source"]] = entry
+    return done
+
+def process_tree(source_dir, out_dir, sizes=DERIVATIVE_SIZES, formats=("webp", "jpeg"), workers=None):
+    """Build derivatives for every photo under source_dir, resuming from the manifest"""
+    os.makedirs(out_dir, exist_ok=True)
+    done = load_manifest(out_dir)
+
+    photos = list_photos(source_dir)
+    pending = []
+    for rel_path in photos:
+        key = source_key(source_dir, rel_path)
+        entry = done.get(rel_path)
+        if entry and entry["key"] == key and entry["formats"] == list(formats):
+            continue
+        pending.append((rel_path, key))
+
+    totals = dict.fromkeys(STAGES, 0.0)
+    processed = 0
+    failed = []
+    start = time.perf_counter()
+
+    with open(os.path.join(out_dir, MANIFEST_NAME), "a", encoding="utf-8") as manifest:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(build_derivatives, source_dir, rel_path, out_dir, sizes, formats): (rel_path, key)
+                for rel_path, key in pending
+            }
+            for future in as_completed(futures):
+                rel_path, key = futures[future]
+                try:
+                    _, outputs, timings = future.result()
+                except Exception as e:
+                    failed.append(f"{rel_path}: {e}")
+                    continue
+                for stage, seconds in timings.items():
+                    totals[stage] += seconds
+                manifest.write(json.dumps({
+                    "source": rel_path,
+                    "key": key,
+                    "formats": list(formats),
+                    "outputs": outputs,
+                }) + "\n")
+                manifest.flush()
+                processed += 1
+
+    return {
+        "processed": processed,
+        "skipped": len(photos) - len(pending),
+        "failed": failed,
+        "elapsed": time.perf_counter() - start,
+        "stages": totals,
+    }
+
+def make_test_corpus(corpus_dir, count=50, size=(3024, 4032), seed=7):
+    """Write synthetic camera-sized JPEGs with assorted EXIF orientations"""
+    rng = random.Random(seed)
+    os.makedirs(corpus_dir, exist_ok=True)
+    for index in range(count):
+        # Smooth gradient plus noise compresses like a real photo
+        base = Image.linear_gradient("L").resize(size).convert("RGB")
+        noise = Image.effect_noise(size, rng.randint(20, 60)).convert("RGB")
+        photo = Image.blend(base, noise, 0.35)
+        exif = Image.Exif()
+        exif[0x0112] = rng.choice([1, 3, 6, 8])  # Orientation
+        subdir = os.path.join(corpus_dir, f"user_{index % 5}")
+        os.makedirs(subdir, exist_ok=True)
+        photo.save(os.path.join(subdir, f"photo_{index:03d}.jpg"), "JPEG", quality=90, exif=exif)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build LumiChat photo derivatives")
+    parser.add_argument("source", help="directory tree of source photos")
+    parser.add_argument("out", help="directory for derivatives and the progress manifest")
+    parser.add_argument("--formats", default="webp,jpeg", help="comma-separated: webp, jpeg")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--make-corpus", type=int, metavar="N",
+                        help="first fill SOURCE with N synthetic test photos")
+    args = parser.parse_args()
+
+    print("🖼️  LumiChat Photo Derivative Builder")
+    print("=" * 50)
+
+    if args.make_corpus:
+        print(f"Creating {args.make_corpus} test photos in {args.source}...")
+        make_test_corpus(args.source, args.make_corpus)
+
+    formats = tuple(fmt.strip() for fmt in args.formats.split(",") if fmt.strip())
+    report = process_tree(args.source, args.out, formats=formats, workers=args.workers)
+
+    processed = report["processed"]
+    rate = processed / report["elapsed"] if report["elapsed"] else 0.0
+    print(f"✓ Processed {processed} photos, skipped {report['skipped']} already done")
+    print(f"⏱️  {report['elapsed']:.2f} s wall, {rate:.1f} images/s")
+    if processed:
+        print("⏱️  Per image (CPU time across workers):")
+        for stage in STAGES:
+            print(f"   • {stage:<7} {report['stages'][stage] / processed * 1000:7.1f} ms")
+
+    if report["failed"]:
+        print(f"\n❌ {len(report['failed'])} photos failed:")
+        for error in report["failed"]:
+            print(f"   • {error}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -5,32 +5,68 @@ Creates a completely redesigned, ultra-professional logo
 Inspired by the most successful app logos: WhatsApp, Instagram, Telegram, Discord
 """
 
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from layer_cache import LAYER_CACHE
+from logo_canvas import RasterCanvas
+from pixel_buffer import COPY_TRACKER
+from render_pipeline import wants, write_to_disk
+from render_shards import add_build_arguments, build, zip_or_check
+import argparse
 import math
 import colorsys
 
-def create_premium_lumichat_logo(size=1024):
-    """Create a completely new premium LumiChat logo"""
-    
-    # Create high-resolution canvas
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    # Premium color palette - inspired by successful messaging apps
-    colors = {
-        # Main gradient (Instagram/Telegram inspired)
-        'primary': (37, 99, 235),      # Blue-600 - #2563EB
-        'secondary': (59, 130, 246),   # Blue-500 - #3B82F6
-        'accent': (96, 165, 250),      # Blue-400 - #60A5FA
-        'light': (147, 197, 253),      # Blue-300 - #93C5FD
-        'highlight': (219, 234, 254),  # Blue-100 - #DBEAFE
-        
-        # Complementary colors
-        'white': (255, 255, 255),
-        'warm_white': (254, 252, 232), # Warm white for highlights
-        'shadow': (15, 23, 42),        # Slate-900 for shadows
-        'glow': (59, 130, 246, 100),   # Semi-transparent blue
-    }
+# Premium color palette - inspired by successful messaging apps
+PREMIUM_COLORS = {
+    # Main gradient (Instagram/Telegram inspired)
+    'primary': (37, 99, 235),      # Blue-600 - #2563EB
+    'secondary': (59, 130, 246),   # Blue-500 - #3B82F6
+    'accent': (96, 165, 250),      # Blue-400 - #60A5FA
+    'light': (147, 197, 253),      # Blue-300 - #93C5FD
+    'highlight': (219, 234, 254),  # Blue-100 - #DBEAFE
+    
+    # Complementary colors
+    'white': (255, 255, 255),
+    'warm_white': (254, 252, 232), # Warm white for highlights
+    'shadow': (15, 23, 42),        # Slate-900 for shadows
+    'glow': (59, 130, 246, 100),   # Semi-transparent blue
+}
+
+# Premium drop shadow system (iOS-style): (offset_x, offset_y, blur_size)
+PREMIUM_SHADOW_LAYERS = [
+    (4, 8, 25),   # Main shadow
+    (2, 4, 15),   # Mid shadow  
+    (1, 2, 8),    # Close shadow
+]
+
+# Sophisticated light rays (8 rays for perfect balance)
+RAY_ANGLES = [0, 45, 90, 135, 180, 225, 270, 315]  # 8-way symmetry
+
+# Concentric ellipses in the background radial gradient
+GRADIENT_STEPS = 60
+
+def ray_angles(count):
+    """Evenly spaced ray angles in degrees"""
+    return [index * 360 / count for index in range(count)]
+
+def palette_key(colors):
+    """Hashable form of a palette for layer cache keys"""
+    return tuple(sorted(colors.items()))
+
+def premium_bubble_box(size):
+    """Chat bubble position and dimensions (golden ratio proportions)"""
+    center = size // 2
+    bubble_width = int(size * 0.28)
+    bubble_height = int(bubble_width * 0.7)
+    bubble_x = center - bubble_width // 2
+    bubble_y = center - bubble_height // 2 - int(size * 0.02)
+    return bubble_x, bubble_y, bubble_width, bubble_height
+
+def lumi_center(size):
+    """Center of the "Lumi" spark, in the bubble's upper right"""
+    bubble_x, bubble_y, bubble_width, bubble_height = premium_bubble_box(size)
+    return bubble_x + int(bubble_width * 0.72), bubble_y + int(bubble_height * 0.28)
+
+def draw_premium_background(canvas, size, gradient_steps=GRADIENT_STEPS, colors=PREMIUM_COLORS):
+    """Draw the outer glow rings and radial gradient disc"""
     
     center = size // 2
     
@@ -41,14 +77,13 @@ def create_premium_lumichat_logo(size=1024):
     for i in range(5, 0, -1):
         glow_alpha = int(30 - i * 4)
         glow_radius = main_radius + i * 6
-        draw.ellipse(
+        canvas.ellipse(
             [center - glow_radius, center - glow_radius,
              center + glow_radius, center + glow_radius],
             fill=(*colors['primary'], glow_alpha)
         )
     
     # Main background with radial gradient (Instagram-style)
-    gradient_steps = 60
     for i in range(gradient_steps, 0, -1):
         ratio = i / gradient_steps
         radius = main_radius * ratio
@@ -70,63 +105,79 @@ def create_premium_lumichat_logo(size=1024):
             # Center - lightest blue
             color = colors['light']
         
-        draw.ellipse(
+        canvas.ellipse(
             [center - radius, center - radius, center + radius, center + radius],
             fill=color
         )
+
+def render_premium_background(size, gradient_steps=GRADIENT_STEPS, colors=PREMIUM_COLORS):
+    """Render the background into a PixelBuffer"""
+    canvas = RasterCanvas.new((size, size))
+    draw_premium_background(canvas, size, gradient_steps, colors)
+    return canvas.buffer
+
+def draw_bubble_shadow(canvas, size, offset_x, offset_y, blur_size, colors=PREMIUM_COLORS):
+    """Draw one drop shadow layer for the chat bubble, before it is blurred"""
+    bubble_x, bubble_y, bubble_width, bubble_height = premium_bubble_box(size)
+    corner_radius = bubble_width // 6
     
-    # Premium drop shadow system (iOS-style)
-    shadow_layers = [
-        (4, 8, 25),   # Main shadow
-        (2, 4, 15),   # Mid shadow  
-        (1, 2, 8),    # Close shadow
+    shadow_alpha = int(120 - blur_size * 3)
+    
+    # Main bubble shadow
+    canvas.rounded_rectangle(
+        [bubble_x + offset_x, bubble_y + offset_y,
+         bubble_x + bubble_width + offset_x, bubble_y + bubble_height + offset_y],
+        radius=corner_radius,
+        fill=(*colors['shadow'], shadow_alpha)
+    )
+    
+    # Bubble tail shadow
+    tail_x = bubble_x + bubble_width // 4
+    tail_y = bubble_y + bubble_height
+    tail_size = bubble_width // 8
+    
+    tail_points = [
+        (tail_x + offset_x, tail_y + offset_y),
+        (tail_x - tail_size + offset_x, tail_y + tail_size * 1.4 + offset_y),
+        (tail_x + tail_size + offset_x, tail_y + offset_y)
     ]
+    canvas.polygon(tail_points, fill=(*colors['shadow'], shadow_alpha))
+
+def create_premium_lumichat_logo(size=1024, include_lumi=True, gradient_steps=GRADIENT_STEPS,
+                                 rays=RAY_ANGLES, shadow_layers=PREMIUM_SHADOW_LAYERS,
+                                 colors=PREMIUM_COLORS):
+    """Create a completely new premium LumiChat logo
+    
+    include_lumi=False stops before the spark, leaving it and the highlights
+    drawn over it to animation frames; the other keywords default to the
+    shipped design and exist for parameter sweeps. Returns a PixelBuffer.
+    """
+    
+    # Create sophisticated background with multiple gradient layers
+    buffer = LAYER_CACHE.get('premium_background', size, (gradient_steps, palette_key(colors)),
+                             lambda: render_premium_background(size, gradient_steps, colors))
+    draw_premium_logo(RasterCanvas(buffer), size, include_lumi, rays, shadow_layers, colors)
+    return buffer
+
+def draw_premium_logo(canvas, size, include_lumi=True, rays=RAY_ANGLES,
+                      shadow_layers=PREMIUM_SHADOW_LAYERS, colors=PREMIUM_COLORS):
+    """Draw everything over the background: shadows, bubble, spark and highlights"""
     
     # Chat bubble dimensions (golden ratio proportions)
-    bubble_width = int(size * 0.28)
-    bubble_height = int(bubble_width * 0.7)
-    bubble_x = center - bubble_width // 2
-    bubble_y = center - bubble_height // 2 - int(size * 0.02)
+    bubble_x, bubble_y, bubble_width, bubble_height = premium_bubble_box(size)
     corner_radius = bubble_width // 6
     
     # Create multiple shadow layers
+    # Premium drop shadow system (iOS-style)
     for offset_x, offset_y, blur_size in shadow_layers:
-        # Create shadow image
-        shadow_img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        shadow_draw = ImageDraw.Draw(shadow_img)
-        
-        shadow_alpha = int(120 - blur_size * 3)
-        
-        # Main bubble shadow
-        shadow_draw.rounded_rectangle(
-            [bubble_x + offset_x, bubble_y + offset_y,
-             bubble_x + bubble_width + offset_x, bubble_y + bubble_height + offset_y],
-            radius=corner_radius,
-            fill=(*colors['shadow'], shadow_alpha)
+        canvas.layer(
+            lambda layer: draw_bubble_shadow(layer, size, offset_x, offset_y, blur_size, colors),
+            blur=blur_size // 2,
+            cache=('bubble_shadow', (offset_x, offset_y, blur_size, colors['shadow']))
         )
-        
-        # Bubble tail shadow
-        tail_x = bubble_x + bubble_width // 4
-        tail_y = bubble_y + bubble_height
-        tail_size = bubble_width // 8
-        
-        tail_points = [
-            (tail_x + offset_x, tail_y + offset_y),
-            (tail_x - tail_size + offset_x, tail_y + tail_size * 1.4 + offset_y),
-            (tail_x + tail_size + offset_x, tail_y + offset_y)
-        ]
-        shadow_draw.polygon(tail_points, fill=(*colors['shadow'], shadow_alpha))
-        
-        # Apply blur
-        if blur_size > 1:
-            shadow_img = shadow_img.filter(ImageFilter.GaussianBlur(radius=blur_size//2))
-        
-        # Composite shadow
-        img = Image.alpha_composite(img, shadow_img)
-        draw = ImageDraw.Draw(img)
     
     # Main chat bubble (pristine design)
-    draw.rounded_rectangle(
+    canvas.rounded_rectangle(
         [bubble_x, bubble_y, bubble_x + bubble_width, bubble_y + bubble_height],
         radius=corner_radius,
         fill=colors['white']
@@ -142,35 +193,87 @@ def create_premium_lumichat_logo(size=1024):
         (tail_x - tail_size, tail_y + int(tail_size * 1.4)),
         (tail_x + tail_size, tail_y)
     ]
-    draw.polygon(tail_points, fill=colors['white'])
+    canvas.polygon(tail_points, fill=colors['white'])
     
     # Premium "Lumi" design - sophisticated light element
-    lumi_center_x = bubble_x + int(bubble_width * 0.72)
-    lumi_center_y = bubble_y + int(bubble_height * 0.28)
+    if include_lumi:
+        draw_lumi_spark(canvas, size, rays=rays, colors=colors)
+        
+        # Highlight and inner glow go over the spark
+        draw_premium_highlights(canvas, size, colors)
+
+def draw_premium_highlights(canvas, size, colors=PREMIUM_COLORS):
+    """Draw the background highlight and the bubble's inner glow
+    
+    Both are translucent layers composited over the spark, so animation
+    frames draw them after their own spark.
+    """
+    center = size // 2
+    main_radius = int(size * 0.42)
+    bubble_x, bubble_y, bubble_width, bubble_height = premium_bubble_box(size)
+    corner_radius = bubble_width // 6
+    
+    # Add premium highlight to main background
+    highlight_size = main_radius // 2
+    highlight_x = center - main_radius // 3
+    highlight_y = center - main_radius // 3
+    
+    # Multi-layer highlight for depth
+    def draw_highlight(layer):
+        for i in range(highlight_size//2, 0, -3):
+            alpha = int(40 * (1 - i / (highlight_size//2)))
+            layer.ellipse(
+                [highlight_x - i, highlight_y - int(i * 1.2),
+                 highlight_x + i, highlight_y + int(i * 1.2)],
+                fill=(*colors['warm_white'], alpha)
+            )
+    canvas.layer(draw_highlight)
+    
+    # Subtle inner glow on bubble
+    glow_margin = 4
+    canvas.layer(lambda layer: layer.rounded_rectangle(
+        [bubble_x + glow_margin, bubble_y + glow_margin,
+         bubble_x + bubble_width - glow_margin, bubble_y + bubble_height - glow_margin],
+        radius=corner_radius - glow_margin//2,
+        outline=(*colors['light'], 60),
+        width=1
+    ))
+
+def draw_lumi_spark(canvas, size, glow=1.0, rotation=0.0, twinkle=1.0, rays=RAY_ANGLES,
+                    colors=PREMIUM_COLORS):
+    """Draw the "Lumi" spark and light rays
+    
+    glow scales the spark halo alpha, rotation turns the rays (degrees) and
+    twinkle scales the inner highlight; the defaults give the static logo.
+    """
+    bubble_x, bubble_y, bubble_width, bubble_height = premium_bubble_box(size)
+    lumi_center_x, lumi_center_y = lumi_center(size)
     
     # Main light source (central spark)
     spark_radius = max(4, size // 160)
     
     # Create glowing effect for spark
-    for i in range(6, 0, -1):
-        alpha = int(200 - i * 25)
-        radius = spark_radius + i
-        draw.ellipse(
-            [lumi_center_x - radius, lumi_center_y - radius,
-             lumi_center_x + radius, lumi_center_y + radius],
-            fill=(*colors['accent'], alpha)
-        )
+    def draw_glow(layer):
+        for i in range(6, 0, -1):
+            alpha = min(255, int((200 - i * 25) * glow))
+            radius = spark_radius + i
+            layer.ellipse(
+                [lumi_center_x - radius, lumi_center_y - radius,
+                 lumi_center_x + radius, lumi_center_y + radius],
+                fill=(*colors['accent'], alpha)
+            )
+    canvas.layer(draw_glow)
     
     # Central spark
-    draw.ellipse(
+    canvas.ellipse(
         [lumi_center_x - spark_radius, lumi_center_y - spark_radius,
          lumi_center_x + spark_radius, lumi_center_y + spark_radius],
         fill=colors['secondary']
     )
     
     # Inner spark highlight
-    inner_radius = max(2, spark_radius // 2)
-    draw.ellipse(
+    inner_radius = max(2, int(spark_radius // 2 * twinkle))
+    canvas.ellipse(
         [lumi_center_x - inner_radius, lumi_center_y - inner_radius,
          lumi_center_x + inner_radius, lumi_center_y + inner_radius],
         fill=colors['white']
@@ -178,81 +281,87 @@ def create_premium_lumichat_logo(size=1024):
     
     # Sophisticated light rays (8 rays for perfect balance)
     ray_length = bubble_width // 5
-    ray_angles = [0, 45, 90, 135, 180, 225, 270, 315]  # 8-way symmetry
-    
-    for angle in ray_angles:
-        angle_rad = math.radians(angle)
-        
-        # Calculate ray endpoints
-        end_x = lumi_center_x + ray_length * math.cos(angle_rad)
-        end_y = lumi_center_y + ray_length * math.sin(angle_rad)
-        
-        # Create gradient ray effect
-        ray_steps = 8
-        for step in range(ray_steps, 0, -1):
-            step_ratio = step / ray_steps
-            step_x = lumi_center_x + (end_x - lumi_center_x) * step_ratio
-            step_y = lumi_center_y + (end_y - lumi_center_y) * step_ratio
+    def draw_rays(layer):
+        for angle in rays:
+            angle_rad = math.radians(angle + rotation)
             
-            # Ray width and alpha based on distance from center
-            ray_width = max(1, int(4 * step_ratio))
-            ray_alpha = int(180 * step_ratio)
+            # Calculate ray endpoints
+            end_x = lumi_center_x + ray_length * math.cos(angle_rad)
+            end_y = lumi_center_y + ray_length * math.sin(angle_rad)
             
-            draw.line(
-                [(lumi_center_x, lumi_center_y), (step_x, step_y)],
-                fill=(*colors['accent'], ray_alpha),
-                width=ray_width
-            )
-    
-    # Add premium highlight to main background
-    highlight_size = main_radius // 2
-    highlight_x = center - main_radius // 3
-    highlight_y = center - main_radius // 3
-    
-    # Multi-layer highlight for depth
-    for i in range(highlight_size//2, 0, -3):
-        alpha = int(40 * (1 - i / (highlight_size//2)))
-        draw.ellipse(
-            [highlight_x - i, highlight_y - int(i * 1.2),
-             highlight_x + i, highlight_y + int(i * 1.2)],
-            fill=(*colors['warm_white'], alpha)
-        )
-    
-    # Subtle inner glow on bubble
-    glow_margin = 4
-    draw.rounded_rectangle(
-        [bubble_x + glow_margin, bubble_y + glow_margin,
-         bubble_x + bubble_width - glow_margin, bubble_y + bubble_height - glow_margin],
-        radius=corner_radius - glow_margin//2,
-        outline=(*colors['light'], 60),
-        width=1
-    )
-    
-    return img
+            # Create gradient ray effect
+            ray_steps = 8
+            for step in range(ray_steps, 0, -1):
+                step_ratio = step / ray_steps
+                step_x = lumi_center_x + (end_x - lumi_center_x) * step_ratio
+                step_y = lumi_center_y + (end_y - lumi_center_y) * step_ratio
+                
+                # Ray width and alpha based on distance from center
+                ray_width = max(1, int(4 * step_ratio))
+                ray_alpha = int(180 * step_ratio)
+                
+                layer.line(
+                    [(lumi_center_x, lumi_center_y), (step_x, step_y)],
+                    fill=(*colors['accent'], ray_alpha),
+                    width=ray_width
+                )
+    canvas.layer(draw_rays)
+
+ANDROID_SIZES = {
+    'mdpi': 48,
+    'hdpi': 72,
+    'xhdpi': 96,
+    'xxhdpi': 144,
+    'xxxhdpi': 192
+}
 
-def create_app_icon_set():
+def iter_app_icon_set(include=None):
+    """Lazily render the premium app icon set as (target_name, image, metadata)"""
+    for density, icon_size in ANDROID_SIZES.items():
+        filename = f'lumichat_premium_{density}.png'
+        if not wants(include, filename):
+            continue
+        metadata = {
+            'density': density,
+            'size': icon_size,
+            'format': 'PNG',
+            'save_args': {'quality': 95, 'optimize': True},
+        }
+        yield filename, create_premium_lumichat_logo(icon_size), metadata
+
+def create_app_icon_set(include=None):
     """Create complete professional app icon set"""
     
-    android_sizes = {
-        'mdpi': 48,
-        'hdpi': 72,
-        'xhdpi': 96,
-        'xxhdpi': 144,
-        'xxxhdpi': 192
-    }
-    
     print("🎨 Creating premium app icon set...")
     
     created_icons = {}
-    for density, icon_size in android_sizes.items():
-        logo = create_premium_lumichat_logo(icon_size)
-        filename = f'lumichat_premium_{density}.png'
-        logo.save(filename, 'PNG', quality=95, optimize=True)
-        created_icons[density] = filename
+    for _, path, metadata in write_to_disk(iter_app_icon_set(include)):
+        density, icon_size = metadata['density'], metadata['size']
+        created_icons[density] = path
         print(f"✓ {density}: {icon_size}x{icon_size}")
     
     return created_icons
 
+# Standard app logo and Ultra HD for marketing: (filename, size, quality)
+MAIN_LOGOS = [
+    ('lumichat_premium_logo.png', 512, 95),
+    ('lumichat_premium_ultra_hd.png', 2048, 98),
+]
+
+def iter_premium_assets(include=None):
+    """Lazily render the main logos and the app icon set"""
+    for filename, size, quality in MAIN_LOGOS:
+        if not wants(include, filename):
+            continue
+        metadata = {
+            'size': size,
+            'format': 'PNG',
+            'save_args': {'quality': quality, 'optimize': True},
+        }
+        yield filename, create_premium_lumichat_logo(size), metadata
+    
+    yield from iter_app_icon_set(include)
+
 def main():
     print("🚀 LumiChat Premium Logo Creator v2.0")
     print("🎯 Target: Ultra-professional, world-class design")
@@ -268,21 +377,21 @@ def main():
     print("   • Glowing effects and premium highlights")
     print()
     
-    # Create main logo assets
-    print("🎨 Creating main logo assets...")
-    
-    # Standard app logo
-    main_logo = create_premium_lumichat_logo(512)
-    main_logo.save('lumichat_premium_logo.png', 'PNG', quality=95, optimize=True)
-    print("✓ Premium logo (512x512)")
+    parser = add_build_arguments(argparse.ArgumentParser(description="Create the premium LumiChat logo assets"))
+    args = parser.parse_args()
+    if args.zip or args.check:
+        exit(zip_or_check(iter_premium_assets, args))
     
-    # Ultra HD for marketing
-    uhd_logo = create_premium_lumichat_logo(2048)
-    uhd_logo.save('lumichat_premium_ultra_hd.png', 'PNG', quality=98, optimize=True)
-    print("✓ Ultra HD logo (2048x2048)")
+    # Create main logo assets and app icons
+    print("🎨 Creating premium logo assets...")
     
-    # Create app icons
-    app_icons = create_app_icon_set()
+    app_icons = {}
+    for filename, path, metadata in build('create_premium_logo_v2', iter_premium_assets, args.shard,
+                                          args.timings, args.manifest_dir, only=args.only):
+        size = metadata['size']
+        if 'density' in metadata:
+            app_icons[metadata['density']] = path
+        print(f"✓ {filename} ({size}x{size})")
     
     print()
     print("🏆 Premium LumiChat Logo v2.0 Complete!")
@@ -293,6 +402,10 @@ def main():
     print("   • Perfect scalability (16px → ∞)")
     print("   • Complete Android icon set")
     print()
+    print(f"🧱 {LAYER_CACHE.summary()}")
+    if COPY_TRACKER.enabled:
+        print(f"📋 {COPY_TRACKER.summary()}")
+    print()
     print("🎯 Ready to compete with the biggest apps! 🚀")
     
     return {
@@ -4,22 +4,65 @@ LumiChat Professional Logo Creator
 Creates a carefully planned, modern logo for LumiChat AI messaging app
 """
 
-from PIL import Image, ImageDraw, ImageFont
+from logo_canvas import RasterCanvas
+from render_pipeline import wants, write_to_disk
+from render_shards import add_build_arguments, build, zip_or_check
+import argparse
 import math
 
+# Brand colors (carefully chosen)
+BRAND_COLORS = {
+    'primary_blue': (74, 144, 226),    # #4A90E2 - Main brand color
+    'light_blue': (107, 182, 255),     # #6BB6FF - Highlight
+    'dark_blue': (46, 91, 186),        # #2E5BBA - Deep shade
+    'white': (255, 255, 255),          # Pure white
+    'gray': (248, 250, 254),           # Off-white for subtle contrast
+}
+
+# Minimal neural network connections between node indices
+NODE_CONNECTIONS = [
+    (0, 1), (1, 2),  # Top row connections
+    (0, 3), (2, 4),  # Cross connections
+    (3, 4)           # Bottom connection
+]
+
+def professional_bubble_box(size):
+    """Chat bubble position and dimensions (centered, professional proportions)"""
+    center = size // 2
+    bubble_width = size // 3
+    bubble_height = int(bubble_width * 0.65)  # Professional aspect ratio
+    bubble_x = center - bubble_width // 2
+    bubble_y = center - bubble_height // 2 - size // 20
+    return bubble_x, bubble_y, bubble_width, bubble_height
+
+def neural_node_positions(size):
+    """Neural network node centers inside the bubble"""
+    center = size // 2
+    _, _, bubble_width, bubble_height = professional_bubble_box(size)
+    return [
+        (center - bubble_width // 5, center - bubble_height // 6),     # Top row
+        (center, center - bubble_height // 6),
+        (center + bubble_width // 5, center - bubble_height // 6),
+        (center - bubble_width // 8, center + bubble_height // 8),     # Bottom row  
+        (center + bubble_width // 8, center + bubble_height // 8),
+    ]
+
 def create_professional_logo(size=512):
-    """Create a professional LumiChat logo based on careful design planning"""
+    """Create a professional LumiChat logo based on careful design planning (as a PixelBuffer)"""
     
     # Create canvas with transparent background
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    canvas = RasterCanvas.new((size, size))
+    draw_professional_logo(canvas, size)
+    return canvas.buffer
+
+def draw_professional_logo(canvas, size):
+    """Draw the professional logo onto a raster or SVG canvas"""
     
     # Brand colors (carefully chosen)
-    primary_blue = (74, 144, 226)      # #4A90E2 - Main brand color
-    light_blue = (107, 182, 255)      # #6BB6FF - Highlight
-    dark_blue = (46, 91, 186)         # #2E5BBA - Deep shade
-    white = (255, 255, 255)           # Pure white
-    gray = (248, 250, 254)            # Off-white for subtle contrast
+    primary_blue = BRAND_COLORS['primary_blue']
+    light_blue = BRAND_COLORS['light_blue']
+    dark_blue = BRAND_COLORS['dark_blue']
+    white = BRAND_COLORS['white']
     
     center = size // 2
     main_radius = size // 2 - 20
@@ -28,7 +71,7 @@ def create_professional_logo(size=512):
     for i in range(3, 0, -1):
         alpha = int(20 - i * 5)
         glow_radius = main_radius + i * 3
-        draw.ellipse(
+        canvas.ellipse(
             [center - glow_radius, center - glow_radius, 
              center + glow_radius, center + glow_radius],
             outline=(*primary_blue, alpha), width=1
@@ -52,29 +95,26 @@ def create_professional_logo(size=512):
             # Inner area: lighter blue
             color = light_blue
         
-        draw.ellipse(
+        canvas.ellipse(
             [center - radius, center - radius, center + radius, center + radius],
             fill=color
         )
     
     # Chat bubble design (centered, professional proportions)
-    bubble_width = size // 3
-    bubble_height = int(bubble_width * 0.65)  # Professional aspect ratio
-    bubble_x = center - bubble_width // 2
-    bubble_y = center - bubble_height // 2 - size // 20
+    bubble_x, bubble_y, bubble_width, bubble_height = professional_bubble_box(size)
     corner_radius = bubble_width // 8
     
     # Chat bubble shadow (subtle)
     shadow_offset = 2
-    draw.rounded_rectangle(
+    canvas.layer(lambda layer: layer.rounded_rectangle(
         [bubble_x + shadow_offset, bubble_y + shadow_offset, 
          bubble_x + bubble_width + shadow_offset, bubble_y + bubble_height + shadow_offset],
         radius=corner_radius,
         fill=(0, 0, 0, 30)
-    )
+    ))
     
     # Main chat bubble (clean white with subtle gradient)
-    draw.rounded_rectangle(
+    canvas.rounded_rectangle(
         [bubble_x, bubble_y, bubble_x + bubble_width, bubble_y + bubble_height],
         radius=corner_radius,
         fill=white
@@ -87,32 +127,20 @@ def create_professional_logo(size=512):
         (bubble_x + bubble_width // 6, bubble_y + bubble_height + tail_size),
         (bubble_x + bubble_width // 3, bubble_y + bubble_height)
     ]
-    draw.polygon(tail_points, fill=white)
+    canvas.polygon(tail_points, fill=white)
     
     # AI Neural Network Design (minimalist, professional)
-    node_positions = [
-        (center - bubble_width // 5, center - bubble_height // 6),     # Top row
-        (center, center - bubble_height // 6),
-        (center + bubble_width // 5, center - bubble_height // 6),
-        (center - bubble_width // 8, center + bubble_height // 8),     # Bottom row  
-        (center + bubble_width // 8, center + bubble_height // 8),
-    ]
+    node_positions = neural_node_positions(size)
     
     # Connection lines (subtle, professional)
     connection_color = (*primary_blue, 60)
     line_width = max(1, size // 256)
     
     # Draw minimal connections
-    connections = [
-        (0, 1), (1, 2),  # Top row connections
-        (0, 3), (2, 4),  # Cross connections
-        (3, 4)           # Bottom connection
-    ]
-    
-    for start_idx, end_idx in connections:
+    for start_idx, end_idx in NODE_CONNECTIONS:
         start_pos = node_positions[start_idx]
         end_pos = node_positions[end_idx]
-        draw.line([start_pos, end_pos], fill=primary_blue, width=line_width)
+        canvas.line([start_pos, end_pos], fill=primary_blue, width=line_width)
     
     # Neural nodes (clean, professional circles)
     node_radius = max(3, size // 128)
@@ -121,14 +149,14 @@ def create_professional_logo(size=512):
     for i, pos in enumerate(node_positions):
         # Outer node circle
         node_color = primary_blue if i < 3 else light_blue
-        draw.ellipse(
+        canvas.ellipse(
             [pos[0] - node_radius, pos[1] - node_radius, 
              pos[0] + node_radius, pos[1] + node_radius],
             fill=node_color
         )
         
         # Inner highlight
-        draw.ellipse(
+        canvas.ellipse(
             [pos[0] - inner_radius, pos[1] - inner_radius,
              pos[0] + inner_radius, pos[1] + inner_radius],
             fill=white
@@ -140,36 +168,58 @@ def create_professional_logo(size=512):
     highlight_radius_x = main_radius // 3
     highlight_radius_y = main_radius // 2
     
-    for i in range(highlight_radius_x, 0, -2):
-        alpha = int(15 * (1 - i / highlight_radius_x))
-        draw.ellipse(
-            [highlight_x - i, highlight_y - int(i * 1.5),
-             highlight_x + i, highlight_y + int(i * 1.5)],
-            fill=(*white, alpha)
-        )
-    
-    return img
+    def draw_highlight(layer):
+        for i in range(highlight_radius_x, 0, -2):
+            alpha = int(15 * (1 - i / highlight_radius_x))
+            layer.ellipse(
+                [highlight_x - i, highlight_y - int(i * 1.5),
+                 highlight_x + i, highlight_y + int(i * 1.5)],
+                fill=(*white, alpha)
+            )
+    canvas.layer(draw_highlight)
+
+ICON_SIZES = {
+    'mdpi': 48,
+    'hdpi': 72, 
+    'xhdpi': 96,
+    'xxhdpi': 144,
+    'xxxhdpi': 192
+}
+
+def iter_app_icons(include=None):
+    """Lazily render app icons as (target_name, image, metadata)"""
+    for density, size in ICON_SIZES.items():
+        filename = f'ic_launcher_{density}.png'
+        if not wants(include, filename):
+            continue
+        metadata = {'density': density, 'size': size, 'format': 'PNG', 'save_args': {}}
+        yield filename, create_professional_logo(size), metadata
 
-def create_app_icons():
+def create_app_icons(include=None):
     """Create various sizes for app icons"""
-    sizes = {
-        'mdpi': 48,
-        'hdpi': 72, 
-        'xhdpi': 96,
-        'xxhdpi': 144,
-        'xxxhdpi': 192
-    }
-    
     icons = {}
-    for density, size in sizes.items():
-        icon = create_professional_logo(size)
-        filename = f'ic_launcher_{density}.png'
-        icon.save(filename, 'PNG')
-        icons[density] = filename
+    for _, path, metadata in write_to_disk(iter_app_icons(include)):
+        density, size = metadata['density'], metadata['size']
+        icons[density] = path
         print(f"✓ Created {density} icon: {size}x{size}")
     
     return icons
 
+# Main logo and HD version: (filename, size)
+MAIN_LOGOS = [
+    ('logo.png', 512),
+    ('logo_hd.png', 1024),
+]
+
+def iter_professional_assets(include=None):
+    """Lazily render the main logos and the app icons"""
+    for filename, size in MAIN_LOGOS:
+        if not wants(include, filename):
+            continue
+        yield filename, create_professional_logo(size), {'size': size, 'format': 'PNG', 'save_args': {}}
+    
+    yield from iter_app_icons(include)
+
 def main():
     print("🎨 Creating Professional LumiChat Logo...")
     print("📋 Design Plan:")
@@ -180,26 +230,24 @@ def main():
     print("   • Subtle lighting and shadow effects")
     print()
     
-    # Create main logo sizes
-    main_logo = create_professional_logo(512)
-    main_logo.save('logo.png', 'PNG')
-    print("✓ Created main logo (512x512)")
-    
-    # Create HD version
-    hd_logo = create_professional_logo(1024)
-    hd_logo.save('logo_hd.png', 'PNG')
-    print("✓ Created HD logo (1024x1024)")
+    parser = add_build_arguments(argparse.ArgumentParser(description="Create the professional LumiChat logo"))
+    args = parser.parse_args()
+    if args.zip or args.check:
+        exit(zip_or_check(iter_professional_assets, args))
     
-    # Create app icons
-    print("\n📱 Creating Android app icons...")
-    icons = create_app_icons()
+    # Create main logo sizes, HD version and app icons
+    created = []
+    for filename, path, metadata in build('create_professional_logo', iter_professional_assets, args.shard,
+                                          args.timings, args.manifest_dir, only=args.only):
+        size = metadata['size']
+        created.append((path, size, metadata.get('density')))
+        print(f"✓ Created {filename} ({size}x{size})")
     
     print(f"\n🎉 Professional LumiChat logo completed!")
     print("📁 Files created:")
-    print("   • logo.png (512x512) - Main app logo")
-    print("   • logo_hd.png (1024x1024) - HD version")
-    for density, filename in icons.items():
-        print(f"   • {filename} - Android {density} icon")
+    for path, size, density in created:
+        role = f"Android {density} icon" if density else "Main app logo"
+        print(f"   • {path} ({size}x{size}) - {role}")
 
 if __name__ == "__main__":
     main()
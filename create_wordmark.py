@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+LumiChat Wordmark & Lockup Creator
+Rasterizes the "LumiChat" wordmark from a bundled font and composes horizontal
+and stacked lockups with the premium icon at every output size
+
+Glyph bitmaps are cached per (font, size, character), so both lockups at a
+size share one rasterization of each glyph.
+"""
+
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+from create_premium_logo_v2 import PREMIUM_COLORS, create_premium_lumichat_logo
+from layer_cache import LAYER_CACHE, LayerCache, image_bytes
+from pixel_buffer import COPY_TRACKER, PixelBuffer
+from render_pipeline import wants
+from render_shards import add_build_arguments, build, zip_or_check
+import argparse
+import functools
+import os
+
+WORDMARK = "LumiChat"
+
+# The app's UI font (GoogleFonts.poppins), vendored under the SIL Open Font License (assets/fonts/OFL.txt)
+FONT_PATH = os.environ.get("LUMICHAT_WORDMARK_FONT", "assets/fonts/Poppins-SemiBold.ttf")
+
+# Lockups drawn with Pillow's stand-in font go here, never into the bundled assets
+PREVIEW_DIR = "wordmark_previews"
+
+# Lockup sizes by icon height: (suffix, height)
+LOCKUP_SIZES = [
+    ("small", 64),
+    ("medium", 96),
+    ("large", 128),
+    ("xl", 192),
+    ("xxl", 256),
+    ("ultra_hd", 512),
+]
+
+# Text size relative to the icon height, shared by both layouts so they share glyphs
+TEXT_SCALE = 0.36
+
+def glyph_bytes(entry):
+    """Size of a glyph cache entry: a glyph's mask or a kerning value"""
+    return image_bytes(entry[0]) if isinstance(entry, tuple) else 8
+
+# Glyph bitmaps and pair kerning, separate from the image layer cache
+GLYPH_CACHE = LayerCache(max_bytes=8 * 1024 * 1024, sizeof=glyph_bytes)
+
+@functools.lru_cache(maxsize=None)
+def load_font(path, size):
+    """Load the bundled font at a pixel size"""
+    if path and os.path.exists(path):
+        return ImageFont.truetype(path, size)
+    return ImageFont.load_default(size)
+
+def font_id(path):
+    """Cache key for the font actually in use"""
+    return path if path and os.path.exists(path) else "pillow-default"
+
+def render_glyph(font, char):
+    """Rasterize one glyph as (mask, (left, top) offset from the pen, advance)"""
+    left, top, right, bottom = font.getbbox(char)
+    mask = Image.new('L', (max(1, right - left), max(1, bottom - top)), 0)
+    ImageDraw.Draw(mask).text((-left, -top), char, font=font, fill=255)
+    return mask, (left, top), font.getlength(char)
+
+def glyph(path, size, char):
+    """Cached glyph bitmap for a font, size and character"""
+    return GLYPH_CACHE.get('glyph', size, (font_id(path), char),
+                           lambda: render_glyph(load_font(path, size), char), copy=False)
+
+def kerning(path, size, left, right):
+    """Pair kerning in pixels, as applied by the font's own layout"""
+    def measure():
+        font = load_font(path, size)
+        return font.getlength(left + right) - font.getlength(left) - font.getlength(right)
+    return GLYPH_CACHE.get('kerning', size, (font_id(path), left + right), measure, copy=False)
+
+def render_wordmark_mask(text, size, path=FONT_PATH):
+    """Compose cached glyphs into a tightly cropped 'L' mask of the text"""
+    placed = []
+    pen = 0.0
+    previous = None
+    for char in text:
+        if previous is not None:
+            pen += kerning(path, size, previous, char)
+        mask, (left, top), advance = glyph(path, size, char)
+        placed.append((mask, round(pen) + left, top))
+        pen += advance
+        previous = char
+
+    min_x = min(x for _, x, _ in placed)
+    min_y = min(y for _, _, y in placed)
+    width = max(x + mask.width for mask, x, _ in placed) - min_x
+    height = max(y + mask.height for mask, _, y in placed) - min_y
+
+    wordmark = Image.new('L', (width, height), 0)
+    for mask, x, y in placed:
+        # Glyph boxes may overlap, so keep the stronger coverage
+        position = (x - min_x, y - min_y)
+        region = wordmark.crop((*position, position[0] + mask.width, position[1] + mask.height))
+        wordmark.paste(ImageChops.lighter(region, mask), position)
+    # Glyph boxes include side bearings; lockups align on the ink
+    return wordmark.crop(wordmark.getbbox())
+
+def render_wordmark(size, path=FONT_PATH, colors=PREMIUM_COLORS):
+    """The wordmark filled with a left-to-right brand gradient"""
+    mask = render_wordmark_mask(WORDMARK, size, path)
+    start, end = colors['secondary'], colors['primary']
+    ramp = Image.linear_gradient('L').rotate(90).resize(mask.size)
+    wordmark = Image.composite(Image.new('RGBA', mask.size, (*end, 255)),
+                               Image.new('RGBA', mask.size, (*start, 255)), ramp)
+    wordmark.putalpha(mask)
+    return wordmark
+
+def lockup_icon(height):
+    """Premium icon shared by both lockups at a size"""
+    return LAYER_CACHE.get('premium_logo', height, (),
+                           lambda: create_premium_lumichat_logo(height), copy=False)
+
+def create_horizontal_lockup(height, path=FONT_PATH):
+    """Icon with the wordmark to its right, vertically centered"""
+    icon = lockup_icon(height)
+    wordmark = render_wordmark(max(8, int(height * TEXT_SCALE)), path)
+    gap = height // 10
+    margin = height // 8
+
+    img = PixelBuffer.new((height + gap + wordmark.width + margin, height))
+    img.alpha_composite(icon, (0, 0))
+    img.alpha_composite(wordmark, (height + gap, (height - wordmark.height) // 2))
+    return img
+
+def create_stacked_lockup(height, path=FONT_PATH):
+    """Icon above the centered wordmark"""
+    icon = lockup_icon(height)
+    wordmark = render_wordmark(max(8, int(height * TEXT_SCALE)), path)
+    gap = height // 16
+    margin = height // 10
+    width = max(height, wordmark.width + 2 * margin)
+
+    img = PixelBuffer.new((width, height + gap + wordmark.height + margin))
+    img.alpha_composite(icon, ((width - height) // 2, 0))
+    img.alpha_composite(wordmark, ((width - wordmark.width) // 2, height + gap))
+    return img
+
+LOCKUPS = {
+    'horizontal': create_horizontal_lockup,
+    'stacked': create_stacked_lockup,
+}
+
+def iter_lockups(include=None):
+    """Lazily render every lockup at every size as (target_name, image, metadata)"""
+    for suffix, height in LOCKUP_SIZES:
+        for layout, create_lockup in LOCKUPS.items():
+            target_name = f"assets/images/logo_{layout}_{suffix}.png"
+            if not wants(include, target_name):
+                continue
+            metadata = {
+                'layout': layout,
+                'height': height,
+                'format': 'PNG',
+                'save_args': {'optimize': True},
+            }
+            yield target_name, create_lockup(height), metadata
+
+def main():
+    parser = add_build_arguments(argparse.ArgumentParser(description="Create the LumiChat wordmark lockups"))
+    parser.add_argument("--allow-fallback-font", action="store_true",
+                        help=f"render with Pillow's bundled font when the brand font is missing, "
+                             f"writing previews to {PREVIEW_DIR}/ instead of the assets")
+    args = parser.parse_args()
+
+    print("🔤 LumiChat Wordmark & Lockup Creator")
+    entry, out_dir = 'create_wordmark', "."
+    if font_id(FONT_PATH) == "pillow-default":
+        if not args.allow_fallback_font:
+            print(f"❌ Brand font {FONT_PATH} not found. Add it (or set LUMICHAT_WORDMARK_FONT), "
+                  f"or pass --allow-fallback-font to preview with Pillow's bundled font")
+            return 1
+        entry, out_dir = 'create_wordmark_preview', PREVIEW_DIR
+        print(f"   ⚠️  {FONT_PATH} not found, using Pillow's bundled font; previews go to {PREVIEW_DIR}/")
+    else:
+        print(f"   Font: {FONT_PATH}")
+    print()
+
+    if args.zip or args.check:
+        return zip_or_check(iter_lockups, args, out_dir)
+
+    for target_name, path, metadata in build(entry, iter_lockups, args.shard, args.timings,
+                                             args.manifest_dir, out_dir, only=args.only):
+        with Image.open(path) as written:
+            print(f"✓ {path} ({written.width}x{written.height})")
+
+    print()
+    glyph_stats = GLYPH_CACHE.stats()
+    print(f"🔠 Glyph cache: {glyph_stats['misses']} glyphs and kerning pairs rasterized/measured, "
+          f"{glyph_stats['hits']} reused")
+    print(f"🧱 {LAYER_CACHE.summary()}")
+    if COPY_TRACKER.enabled:
+        print(f"📋 {COPY_TRACKER.summary()}")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+LumiChat Local Derivative Server
+A development stand-in for the Cloudinary transforms used by chat image rendering
+
+    GET /<path under root>?w=320&h=320&f=webp&q=80&theme=teal
+
+Derivatives are rendered on a process pool with the photo/logo resize, recolor
+and encode stages, cached in a byte-budgeted LRU, and concurrent requests for
+the same derivative share one render.
+"""
+
+from PIL import Image, ImageOps
+from concurrent.futures import ProcessPoolExecutor
+from layer_cache import LayerCache
+from logo_color_fixer import THEME_PRIMARY, THEME_SECONDARY, recolor_to_theme, rgb_to_hsl
+from render_pipeline import encode, to_working_mode
+from urllib.parse import parse_qs, quote, urlsplit, unquote
+import argparse
+import asyncio
+import os
+import random
+import time
+
+DEFAULT_ROOT = "assets/images"
+DEFAULT_CACHE_MB = 128
+MAX_DIMENSION = 4096
+
+CONTENT_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg", "png": "image/png"}
+SAVE_FORMATS = {"webp": "WEBP", "jpeg": "JPEG", "png": "PNG"}
+
+THEMES = {
+    "teal": THEME_PRIMARY,
+    "purple": THEME_SECONDARY,
+}
+
+class BadRequest(Exception):
+    """Raised for malformed transform parameters"""
+
+def theme_hue(theme):
+    """Hue for a named theme or a hex color like 14B8A6"""
+    if theme in THEMES:
+        return rgb_to_hsl(*THEMES[theme])[0]
+    try:
+        value = int(theme.lstrip("#"), 16)
+    except ValueError:
+        raise BadRequest(f"unknown theme: {theme}")
+    return rgb_to_hsl((value >> 16) & 255, (value >> 8) & 255, value & 255)[0]
+
+def parse_transform(target):
+    """Turn a request target into (rel_path, width, height, fmt, quality, theme)"""
+    parts = urlsplit(target)
+    rel_path = os.path.normpath(unquote(parts.path).lstrip("/"))
+    if rel_path.startswith("..") or os.path.isabs(rel_path):
+        raise BadRequest("path escapes the image root")
+
+    query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+    try:
+        width = int(query.get("w", 0))
+        height = int(query.get("h", 0))
+        quality = int(query.get("q", 82))
+    except ValueError:
+        raise BadRequest("w, h and q must be integers")
+    if not (0 <= width <= MAX_DIMENSION and 0 <= height <= MAX_DIMENSION and 1 <= quality <= 100):
+        raise BadRequest("transform out of range")
+
+    fmt = query.get("f", "webp").lower().replace("jpg", "jpeg")
+    if fmt not in SAVE_FORMATS:
+        raise BadRequest(f"unsupported format: {fmt}")
+
+    theme = query.get("theme") or None
+    if theme:
+        theme_hue(theme)
+    return rel_path, width, height, fmt, quality, theme
+
+def render_derivative(root, rel_path, width, height, fmt, quality, theme):
+    """Decode, resize, recolor and encode one derivative (runs in a worker process)"""
+    path = os.path.join(root, rel_path)
+    img = Image.open(path)
+
+    if width or height:
+        bound = max(width, height)
+        img.draft("RGB", (bound, bound))
+    img = ImageOps.exif_transpose(img)
+    img = to_working_mode(img)
+
+    # Fit inside w x h (either may be omitted), never upscaling
+    if width or height:
+        scale = min(width / img.width if width else 1.0,
+                    height / img.height if height else 1.0, 1.0)
+        target_size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+        if target_size != img.size:
+            img = img.resize(target_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+    # Recolor after resizing so the per-pixel pass only touches output pixels
+    if theme:
+        recolor_to_theme(img, theme_hue(theme))
+
+    if fmt == "jpeg":
+        img = img.convert("RGB")
+    return encode(img, {"format": SAVE_FORMATS[fmt], "save_args": {"quality": quality}})
+
+def source_stamp(root, rel_path):
+    """(mtime_ns, size) of a source image; raises FileNotFoundError if it is missing"""
+    path = os.path.join(root, rel_path)
+    if not os.path.isfile(path):
+        raise FileNotFoundError(rel_path)
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+class DerivativeServer:
+    """Serves cached derivatives and collapses duplicate in-flight renders"""
+
+    def __init__(self, root=DEFAULT_ROOT, cache_bytes=DEFAULT_CACHE_MB * 1024 * 1024, workers=None):
+        self.root = root
+        self.cache = LayerCache(cache_bytes, sizeof=len)
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.in_flight = {}
+        self.collapsed = 0
+        self.renders = 0
+
+    async def derivative(self, transform):
+        """Return (data, cache_status) for a parsed transform"""
+        rel_path = transform[0]
+        # Key on the source's stamp too, so an edited image is rendered afresh
+        key = (transform, source_stamp(self.root, rel_path))
+
+        # Join an in-flight render before touching the cache, so collapsed
+        # requests are not counted as cache misses
+        pending = self.in_flight.get(key)
+        if pending is not None:
+            self.collapsed += 1
+            return await asyncio.shield(pending), "COLLAPSED"
+
+        data = self.cache.fetch("derivative", rel_path, key)
+        if data is not None:
+            return data, "HIT"
+
+        loop = asyncio.get_running_loop()
+        pending = loop.run_in_executor(self.pool, render_derivative, self.root, *transform)
+        self.in_flight[key] = pending
+        self.renders += 1
+        try:
+            data = await asyncio.shield(pending)
+        finally:
+            del self.in_flight[key]
+        self.cache.store("derivative", rel_path, key, data)
+        return data, "MISS"
+
+    async def handle(self, reader, writer):
+        """Serve HTTP/1.1 requests on one keep-alive connection"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    await self.respond(writer, 400, b"bad request line")
+                    break
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                if method != "GET":
+                    await self.respond(writer, 405, b"only GET is supported", keep_alive)
+                elif urlsplit(target).path == "/stats":
+                    await self.respond(writer, 200, self.stats_line().encode(), keep_alive)
+                else:
+                    await self.serve_derivative(writer, target, keep_alive)
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve_derivative(self, writer, target, keep_alive):
+        """Parse, render or fetch, and write one derivative response"""
+        try:
+            transform = parse_transform(target)
+            data, status = await self.derivative(transform)
+        except BadRequest as e:
+            await self.respond(writer, 400, str(e).encode(), keep_alive)
+        except FileNotFoundError:
+            await self.respond(writer, 404, b"not found", keep_alive)
+        except Exception as e:
+            await self.respond(writer, 500, f"render failed: {e}".encode(), keep_alive)
+        else:
+            await self.respond(writer, 200, data, keep_alive,
+                               CONTENT_TYPES[transform[3]], {"X-Cache": status})
+
+    async def respond(self, writer, status, body, keep_alive=False,
+                      content_type="text/plain; charset=utf-8", extra_headers=None):
+        """Write a complete HTTP response"""
+        reasons = {200: "OK", 400: "Bad Request", 404: "Not Found",
+                   405: "Method Not Allowed", 500: "Internal Server Error"}
+        lines = [
+            f"HTTP/1.1 {status} {reasons[status]}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        for name, value in (extra_headers or {}).items():
+            lines.append(f"{name}: {value}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    def stats_line(self):
+        """Cache and render counters"""
+        return f"{self.cache.summary()}; {self.renders} renders, {self.collapsed} collapsed"
+
+    def close(self):
+        self.pool.shutdown()
+
+async def fetch(host, port, target, connection, close=False):
+    """GET target over a keep-alive connection, returning (status, x_cache, connection)"""
+    if connection is None:
+        connection = await asyncio.open_connection(host, port)
+    reader, writer = connection
+    headers = f"Host: {host}\r\n" + ("Connection: close\r\n" if close else "")
+    writer.write(f"GET {target} HTTP/1.1\r\n{headers}\r\n".encode("latin-1"))
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length, x_cache = 0, ""
+    while True:
+        line = (await reader.readline()).decode("latin-1")
+        if line in ("\r\n", "\n", ""):
+            break
+        name, _, value = line.partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+        elif name.lower() == "x-cache":
+            x_cache = value.strip()
+    await reader.readexactly(length)
+    return status, x_cache, connection
+
+def build_targets(root, count=40, seed=11):
+    """A mix of derivative URLs over the images under root"""
+    rng = random.Random(seed)
+    sources = [name for name in sorted(os.listdir(root))
+               if name.lower().endswith((".png", ".jpg", ".jpeg", ".webp"))]
+    targets = []
+    for _ in range(count):
+        params = f"w={rng.choice([64, 128, 150, 320, 512])}&f={rng.choice(['webp', 'jpeg', 'png'])}"
+        if rng.random() < 0.25:
+            params += f"&theme={rng.choice(list(THEMES))}"
+        targets.append(f"/{quote(rng.choice(sources))}?{params}")
+    return targets
+
+async def load_test(host, port, targets, requests, concurrency, seed=5):
+    """Hit the server with Zipf-like popularity; returns latencies and cache statuses"""
+    rng = random.Random(seed)
+    # Popular derivatives dominate, like avatars in a chat list
+    weights = [1 / (rank + 1) for rank in range(len(targets))]
+    schedule = rng.choices(targets, weights, k=requests)
+    latencies, statuses = [], {}
+
+    async def worker(worker_targets):
+        connection = None
+        for index, target in enumerate(worker_targets):
+            start = time.perf_counter()
+            # Closing on the last request lets the server finish the connection cleanly
+            last = index == len(worker_targets) - 1
+            status, x_cache, connection = await fetch(host, port, target, connection, last)
+            latencies.append(time.perf_counter() - start)
+            key = x_cache if status == 200 else str(status)
+            statuses[key] = statuses.get(key, 0) + 1
+        if connection is not None:
+            connection[1].close()
+            await connection[1].wait_closed()
+
+    await asyncio.gather(*(worker(schedule[i::concurrency]) for i in range(concurrency)))
+    return latencies, statuses
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def serve(args):
+    server = DerivativeServer(args.root, args.cache_mb * 1024 * 1024, args.workers)
+    listener = await asyncio.start_server(server.handle, args.host, args.port)
+    port = listener.sockets[0].getsockname()[1]
+    print(f"🌐 Serving {args.root} on http://{args.host}:{port}/")
+
+    try:
+        if args.load_test:
+            targets = build_targets(args.root, args.targets)
+            start = time.perf_counter()
+            latencies, statuses = await load_test(args.host, port, targets,
+                                                  args.load_test, args.concurrency)
+            elapsed = time.perf_counter() - start
+            print(f"✓ {len(latencies)} requests in {elapsed:.2f} s "
+                  f"({len(latencies) / elapsed:.0f} req/s, concurrency {args.concurrency})")
+            print(f"⏱️  p50 {percentile(latencies, 0.50) * 1000:.1f} ms, "
+                  f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms")
+            print(f"📊 Responses: {statuses}")
+            print(f"🧱 {server.stats_line()}")
+        else:
+            async with listener:
+                await listener.serve_forever()
+    finally:
+        listener.close()
+        server.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Local LumiChat image derivative server")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="directory of source images")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--cache-mb", type=int, default=DEFAULT_CACHE_MB)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--load-test", type=int, metavar="N",
+                        help="run the bundled load generator for N requests, then exit")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--targets", type=int, default=40, help="distinct derivative URLs")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
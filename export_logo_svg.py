@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+LumiChat Logo SVG Export
+Emits the premium and professional logos as SVG by running the raster creators'
+drawing code on an SVG canvas, and checks them against the PNGs
+"""
+
+from PIL import Image
+from create_premium_logo_v2 import (GRADIENT_STEPS, PREMIUM_COLORS, PREMIUM_SHADOW_LAYERS, RAY_ANGLES,
+                                    create_premium_lumichat_logo, draw_premium_background,
+                                    draw_premium_logo, iter_premium_assets)
+from create_professional_logo import create_professional_logo, draw_professional_logo, iter_professional_assets
+from logo_canvas import SvgCanvas
+from pixel_buffer import as_image
+from render_pipeline import encode
+from render_shards import list_targets
+import argparse
+import gzip
+import io
+import math
+import numpy as np
+import os
+
+# Design size of the exported viewBox; the SVG scales to any size
+SVG_SIZE = 512
+
+# Equivalence check: a channel differing by more than VISIBLE_DIFFERENCE is
+# visible; anti-aliased SVG edges against hard raster edges stay under these
+MIN_PSNR = 30
+MAX_VISIBLY_DIFFERENT = 0.01
+VISIBLE_DIFFERENCE = 24
+
+def premium_logo_svg(size=SVG_SIZE, gradient_steps=GRADIENT_STEPS, rays=RAY_ANGLES,
+                     shadow_layers=PREMIUM_SHADOW_LAYERS, colors=PREMIUM_COLORS):
+    """SVG for create_premium_lumichat_logo, drawn by the same code"""
+    canvas = SvgCanvas((size, size))
+    draw_premium_background(canvas, size, gradient_steps, colors)
+    draw_premium_logo(canvas, size, rays=rays, shadow_layers=shadow_layers, colors=colors)
+    return canvas.to_svg()
+
+def professional_logo_svg(size=SVG_SIZE):
+    """SVG for create_professional_logo, drawn by the same code"""
+    canvas = SvgCanvas((size, size))
+    draw_professional_logo(canvas, size)
+    return canvas.to_svg()
+
+def rasterize_svg(svg, size):
+    """Render SVG markup to an RGBA image, or None if no rasterizer is installed"""
+    try:
+        import cairosvg
+        data = cairosvg.svg2png(bytestring=svg.encode("utf-8"), output_width=size, output_height=size)
+    except (ImportError, OSError):
+        try:
+            import resvg_py
+            data = bytes(resvg_py.svg_to_bytes(svg_string=svg, width=size, height=size))
+        except ImportError:
+            return None
+    return Image.open(io.BytesIO(data)).convert("RGBA")
+
+def compare_on_white(reference, candidate):
+    """Mean absolute error, PSNR and share of visibly different pixels, both flattened onto white"""
+    candidate = candidate.resize(reference.size)
+    white = Image.new("RGBA", reference.size, (255, 255, 255, 255))
+    a = np.asarray(Image.alpha_composite(white, reference).convert("RGB"), dtype=np.int16)
+    b = np.asarray(Image.alpha_composite(white, candidate).convert("RGB"), dtype=np.int16)
+    diff = np.abs(a - b)
+    mse = np.mean(diff.astype(np.float64) ** 2)
+    return {
+        "mean_abs_error": float(diff.mean()),
+        "psnr": float("inf") if mse == 0 else 10 * math.log10(255 * 255 / mse),
+        "visibly_different": float(np.mean(diff.max(axis=2) > VISIBLE_DIFFERENCE)),
+    }
+
+def matches(metrics):
+    """Whether an SVG rendering is equivalent to the PNG, judged over every pixel"""
+    return metrics["psnr"] >= MIN_PSNR and metrics["visibly_different"] <= MAX_VISIBLY_DIFFERENT
+
+def raster_set_bytes(iter_targets):
+    """Bytes of the PNG set the SVG replaces (on disk where present, else freshly encoded)"""
+    total = 0
+    names = list_targets(iter_targets)
+    missing = [name for name in names if not os.path.exists(name)]
+    total += sum(os.path.getsize(name) for name in names if os.path.exists(name))
+    if missing:
+        for _, image, metadata in iter_targets(set(missing).__contains__):
+            total += len(encode(image, metadata))
+    return total, len(names)
+
+EXPORTS = {
+    "premium": ("lumichat_premium_logo.svg", premium_logo_svg, create_premium_lumichat_logo, iter_premium_assets),
+    "professional": ("lumichat_professional_logo.svg", professional_logo_svg, create_professional_logo, iter_professional_assets),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the LumiChat logos as SVG")
+    parser.add_argument("--out-dir", default=".")
+    parser.add_argument("--check-size", type=int, default=SVG_SIZE,
+                        help="raster size for the equivalence check")
+    parser.add_argument("logos", nargs="*",
+                        help=f"logos to export: {', '.join(EXPORTS)} (default: all)")
+    args = parser.parse_args()
+    unknown = [name for name in args.logos if name not in EXPORTS]
+    if unknown:
+        parser.error(f"unknown logo: {', '.join(unknown)}")
+
+    print("✏️  LumiChat Logo SVG Export")
+    print("=" * 50)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    mismatched = []
+
+    for name in args.logos or EXPORTS:
+        filename, make_svg, make_raster, iter_targets = EXPORTS[name]
+        svg = make_svg(SVG_SIZE)
+        path = os.path.join(args.out_dir, filename)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(svg)
+
+        svg_bytes = len(svg.encode("utf-8"))
+        gzip_bytes = len(gzip.compress(svg.encode("utf-8"), 9))
+        png_bytes, png_count = raster_set_bytes(iter_targets)
+
+        print(f"\n✓ {path}")
+        print(f"   • SVG {svg_bytes / 1024:.1f} KB ({gzip_bytes / 1024:.1f} KB gzipped) "
+              f"vs {png_count} PNGs totalling {png_bytes / 1024:.1f} KB")
+
+        # Some offsets are fixed pixel counts, so check against geometry built for that size
+        rendered = rasterize_svg(make_svg(args.check_size), args.check_size)
+        if rendered is None:
+            print("   • Equivalence check skipped (install cairosvg or resvg-py)")
+            continue
+        metrics = compare_on_white(as_image(make_raster(args.check_size)), rendered)
+        status = "✅" if matches(metrics) else "❌"
+        if not matches(metrics):
+            mismatched.append(name)
+        print(f"   • {status} vs PNG at {args.check_size}px, all pixels: PSNR {metrics['psnr']:.1f} dB "
+              f"(min {MIN_PSNR}), mean error {metrics['mean_abs_error']:.2f}, "
+              f"{metrics['visibly_different'] * 100:.2f}% pixels visibly different "
+              f"(max {MAX_VISIBLY_DIFFERENT * 100:.0f}%)")
+
+    if mismatched:
+        print(f"\n❌ SVG does not match the PNGs: {', '.join(mismatched)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+LumiChat Layer Cache
+Memoizes rendered RGBA sub-layers keyed on (layer type, parameters, size)
+with LRU eviction under a byte budget
+"""
+
+from collections import OrderedDict
+import os
+import threading
+
+# Default budget, overridable with LUMICHAT_LAYER_CACHE_MB
+DEFAULT_MAX_BYTES = int(float(os.environ.get("LUMICHAT_LAYER_CACHE_MB", "64")) * 1024 * 1024)
+
+def image_bytes(img):
+    """Size of an image's pixel buffer"""
+    if hasattr(img, "nbytes"):
+        return img.nbytes
+    return img.width * img.height * len(img.getbands())
+
+class LayerCache:
+    """LRU cache of rendered layers bounded by total pixel bytes
+
+    sizeof measures a cached value; pass len to cache encoded bytes instead of images.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, sizeof=image_bytes):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._layers = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, kind, size, params, render, copy=True):
+        """Return the layer, rendering it on a miss
+
+        render() is only called on a miss. With copy=False the shared cached
+        image is returned and must not be modified.
+        """
+        layer = self.fetch(kind, size, params)
+        if layer is None:
+            layer = render()
+            self.store(kind, size, params, layer)
+        return layer.copy() if copy else layer
+
+    def fetch(self, kind, size, params):
+        """Look up a cached value (None on a miss), updating recency and counters"""
+        key = (kind, size, params)
+        with self._lock:
+            layer = self._layers.get(key)
+            if layer is None:
+                self.misses += 1
+                return None
+            self._layers.move_to_end(key)
+            self.hits += 1
+            return layer
+
+    def store(self, kind, size, params, layer):
+        """Insert a value and evict least recently used ones over budget"""
+        key = (kind, size, params)
+        layer_bytes = self.sizeof(layer)
+        if layer_bytes > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._layers:
+                return
+            self._layers[key] = layer
+            self.current_bytes += layer_bytes
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._layers.popitem(last=False)
+                self.current_bytes -= self.sizeof(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every cached layer (counters are kept)"""
+        with self._lock:
+            self._layers.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Counters for the run summary"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "layers": len(self._layers),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def summary(self):
+        """One-line description of cache effectiveness"""
+        stats = self.stats()
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / lookups * 100 if lookups else 0.0
+        return (f"Layer cache: {stats['hits']} hits, {stats['misses']} misses "
+                f"({hit_rate:.0f}% hit rate), {stats['evictions']} evictions, "
+                f"{stats['bytes'] / 1024 / 1024:.1f}/{stats['max_bytes'] / 1024 / 1024:.0f} MB")
+
+# Shared cache used by the logo generators
+LAYER_CACHE = LayerCache()
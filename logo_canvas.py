@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+LumiChat Logo Canvas
+One drawing surface for the procedural logos with a raster and a vector backend,
+so the PNG and SVG exports come from the same draw calls
+
+Both canvases take ImageDraw's ellipse, rounded_rectangle, polygon and line calls.
+Shapes drawn directly replace the pixels under them, exactly like ImageDraw;
+canvas.layer(draw) draws onto a transparent layer that is then alpha-composited,
+which is how translucent overlays blend with what is beneath them.
+"""
+
+from PIL import ImageDraw, ImageFilter
+from layer_cache import LAYER_CACHE
+from pixel_buffer import PixelBuffer, as_image
+import math
+
+class RasterCanvas:
+    """Draws into a PixelBuffer with ImageDraw"""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self._draw = ImageDraw.Draw(buffer.to_image())
+
+    @classmethod
+    def new(cls, size):
+        """Canvas over a new transparent buffer of size (width, height)"""
+        return cls(PixelBuffer.new(size))
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        self._draw.ellipse(xy, fill=fill, outline=outline, width=width)
+
+    def rounded_rectangle(self, xy, radius=0, fill=None, outline=None, width=1):
+        self._draw.rounded_rectangle(xy, radius=radius, fill=fill, outline=outline, width=width)
+
+    def polygon(self, xy, fill=None, outline=None):
+        self._draw.polygon(xy, fill=fill, outline=outline)
+
+    def line(self, xy, fill=None, width=0):
+        self._draw.line(xy, fill=fill, width=width)
+
+    def layer(self, draw, blur=0, cache=None):
+        """Composite a layer drawn by draw(canvas), Gaussian-blurred by blur pixels
+
+        cache=(kind, params) keeps the finished layer in LAYER_CACHE, so draw
+        only runs on a miss.
+        """
+        def render():
+            layer = RasterCanvas.new(self.buffer.size)
+            draw(layer)
+            img = as_image(layer.buffer)
+            return img.filter(ImageFilter.GaussianBlur(radius=blur)) if blur else img
+
+        if cache is None:
+            img = render()
+        else:
+            kind, params = cache
+            img = LAYER_CACHE.get(kind, self.buffer.size, params, render, copy=False)
+        self.buffer.alpha_composite(img)
+
+def _n(value):
+    """Compact number formatting for path data"""
+    text = f"{value:.2f}".rstrip("0").rstrip(".")
+    return text if text not in ("-0", "") else "0"
+
+def _paint(color):
+    """SVG color and opacity for an RGB or RGBA tuple"""
+    alpha = color[3] if len(color) > 3 else 255
+    return "#{:02x}{:02x}{:02x}".format(*color[:3]), alpha
+
+def _clockwise(points):
+    """Points ordered clockwise on screen, so unioned subpaths never cancel out"""
+    area = sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(points, points[1:] + points[:1]))
+    return points if area >= 0 else points[::-1]
+
+def _polygon_path(points):
+    return "M" + "L".join(f"{_n(x)} {_n(y)}" for x, y in _clockwise(points)) + "Z"
+
+class _Shape:
+    """A filled ImageDraw primitive in SVG coordinates
+
+    ImageDraw covers the pixels whose centers fall inside a shape, so SVG
+    coordinates are the raster ones shifted by half a pixel.
+    """
+
+    def __init__(self, kind, geometry, fill):
+        self.kind = kind
+        self.geometry = geometry
+        self.fill = fill
+
+    @classmethod
+    def ellipse(cls, xy, fill):
+        # ImageDraw truncates ellipse boxes to whole pixels and covers both corners
+        x0, y0, x1, y1 = (int(value) for value in xy)
+        return cls("ellipse", ((x0 + x1) / 2 + 0.5, (y0 + y1) / 2 + 0.5,
+                               (x1 - x0) / 2 + 0.5, (y1 - y0) / 2 + 0.5), fill)
+
+    @classmethod
+    def line(cls, xy, width, fill):
+        # Wide lines put the odd pixel on one side of the center line, like ImageDraw
+        (x0, y0), (x1, y1) = ((int(x), int(y)) for x, y in xy)
+        length = math.hypot(x1 - x0, y1 - y0)
+        ux, uy = ((x1 - x0) / length, (y1 - y0) / length) if length else (1, 0)
+        major = math.ceil((max(1, width) - 1) / 2)
+        minor = math.floor((max(1, width) - 1) / 2)
+        return cls("line", ((x0, y0), (ux, uy), length, major, minor), fill)
+
+    @property
+    def path(self):
+        """Clockwise subpath for this shape"""
+        if self.kind == "ellipse":
+            cx, cy, rx, ry = self.geometry
+            arc = f"A{_n(rx)} {_n(ry)} 0 1 1 "
+            return f"M{_n(cx - rx)} {_n(cy)}{arc}{_n(cx + rx)} {_n(cy)}{arc}{_n(cx - rx)} {_n(cy)}Z"
+        if self.kind == "line":
+            (x0, y0), (ux, uy), length, major, minor = self.geometry
+            # The side carrying the odd pixel flips for steep lines
+            nx, ny = (uy, -ux) if abs(uy) > abs(ux) else (-uy, ux)
+            major, minor = major + 0.5, minor + 0.5
+            start = (x0 + 0.5 - ux / 2, y0 + 0.5 - uy / 2)
+            end = (x0 + 0.5 + ux * (length + 0.5), y0 + 0.5 + uy * (length + 0.5))
+            return _polygon_path([(start[0] + nx * major, start[1] + ny * major),
+                                  (end[0] + nx * major, end[1] + ny * major),
+                                  (end[0] - nx * minor, end[1] - ny * minor),
+                                  (start[0] - nx * minor, start[1] - ny * minor)])
+        if self.kind == "rounded_rectangle":
+            x0, y0, x1, y1, r = self.geometry
+            arc = f"A{_n(r)} {_n(r)} 0 0 1 "
+            return (f"M{_n(x0 + r)} {_n(y0)}H{_n(x1 - r)}{arc}{_n(x1)} {_n(y0 + r)}"
+                    f"V{_n(y1 - r)}{arc}{_n(x1 - r)} {_n(y1)}H{_n(x0 + r)}{arc}{_n(x0)} {_n(y1 - r)}"
+                    f"V{_n(y0 + r)}{arc}{_n(x0 + r)} {_n(y0)}Z")
+        return _polygon_path(self.geometry)
+
+    def contains(self, other):
+        """Whether other lies inside this shape (only checked for nested ellipses and lines)"""
+        if self.kind != other.kind:
+            return False
+        if self.kind == "ellipse":
+            cx, cy, rx, ry = self.geometry
+            other_cx, other_cy, other_rx, other_ry = other.geometry
+            return (cx, cy) == (other_cx, other_cy) and other_rx <= rx and other_ry <= ry
+        if self.kind == "line":
+            start, (ux, uy), length, major, minor = self.geometry
+            other_start, (other_ux, other_uy), other_length, other_major, other_minor = other.geometry
+            return (start == other_start and abs(ux - other_ux) + abs(uy - other_uy) < 0.02
+                    and other_length <= length and other_major <= major and other_minor <= minor)
+        return False
+
+class SvgCanvas:
+    """Records the same draw calls as SVG paths
+
+    SVG only blends, so replacement is reproduced for the shapes the logos
+    stack: a translucent shape drawn over a shape it is nested in cuts a hole
+    (even-odd fill), and a shape nested in one of the same color is dropped.
+    Other overlapping translucent shapes in one layer blend where ImageDraw
+    would replace.
+    """
+
+    def __init__(self, size, filters=None):
+        self.size = size
+        self._elements = []
+        self._filters = {} if filters is None else filters
+        # Same-colored filled shapes not yet written, unioned into one path
+        self._pending = []
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        if fill is not None:
+            self._fill(_Shape.ellipse(xy, fill))
+        if outline is not None:
+            x0, y0, x1, y1 = (int(value) for value in xy)
+            self._stroke(f'<ellipse cx="{_n((x0 + x1) / 2 + 0.5)}" cy="{_n((y0 + y1) / 2 + 0.5)}" '
+                         f'rx="{_n((x1 - x0) / 2 + 0.5 - width / 2)}" ry="{_n((y1 - y0) / 2 + 0.5 - width / 2)}"',
+                         outline, width)
+
+    def rounded_rectangle(self, xy, radius=0, fill=None, outline=None, width=1):
+        x0, y0, x1, y1 = xy
+        if fill is not None:
+            self._fill(_Shape("rounded_rectangle", (x0, y0, x1 + 1, y1 + 1, radius + 0.5), fill))
+        if outline is not None:
+            inset = width / 2
+            self._stroke(f'<rect x="{_n(x0 + inset)}" y="{_n(y0 + inset)}" width="{_n(x1 - x0 + 1 - width)}" '
+                         f'height="{_n(y1 - y0 + 1 - width)}" rx="{_n(radius + 0.5 - inset)}"', outline, width)
+
+    def polygon(self, xy, fill=None, outline=None):
+        points = [(x + 0.5, y + 0.5) for x, y in xy]
+        if fill is not None:
+            self._fill(_Shape("polygon", points, fill))
+        if outline is not None:
+            self._stroke(f'<path d="{_polygon_path(points)}"', outline, 1)
+
+    def line(self, xy, fill=None, width=0):
+        self._fill(_Shape.line(xy, width, fill))
+
+    def layer(self, draw, blur=0, cache=None):
+        """Group the shapes drawn by draw(canvas), blurred with an SVG filter"""
+        self._flush()
+        layer = SvgCanvas(self.size, self._filters)
+        draw(layer)
+        layer._flush()
+        if not blur:
+            self._elements.extend(layer._elements)
+            return
+        filter_id = f"blur{_n(blur)}"
+        self._filters[filter_id] = (f'<filter id="{filter_id}" x="-50%" y="-50%" width="200%" height="200%">'
+                                    f'<feGaussianBlur stdDeviation="{_n(blur)}"/></filter>')
+        self._elements.append(f'<g filter="url(#{filter_id})">{"".join(layer._elements)}</g>')
+
+    def to_svg(self):
+        """The drawing as a standalone SVG document"""
+        self._flush()
+        width, height = self.size
+        defs = f'<defs>{"".join(self._filters.values())}</defs>' if self._filters else ""
+        return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                f'viewBox="0 0 {width} {height}">{defs}{"".join(self._elements)}</svg>')
+
+    def _fill(self, shape):
+        if self._pending and shape.fill == self._pending[0].fill:
+            # Same color: nested shapes change nothing, others join the union
+            if not any(pending.contains(shape) for pending in self._pending):
+                self._pending.append(shape)
+            return
+        hole = None
+        if len(self._pending) == 1 and _paint(self._pending[0].fill)[1] < 255 and self._pending[0].contains(shape):
+            hole = shape
+        self._flush(hole)
+        self._pending = [shape]
+
+    def _flush(self, hole=None):
+        """Write the pending union, with hole cut out of it"""
+        if not self._pending:
+            return
+        color, alpha = _paint(self._pending[0].fill)
+        path = "".join(shape.path for shape in self._pending)
+        attributes = f' fill="{color}"'
+        if alpha < 255:
+            attributes += f' fill-opacity="{_n(alpha / 255)}"'
+        if hole is not None:
+            path += hole.path
+            attributes += ' fill-rule="evenodd"'
+        self._elements.append(f'<path d="{path}"{attributes}/>')
+        self._pending = []
+
+    def _stroke(self, element, outline, width):
+        self._flush()
+        color, alpha = _paint(outline)
+        opacity = f' stroke-opacity="{_n(alpha / 255)}"' if alpha < 255 else ""
+        self._elements.append(f'{element} fill="none" stroke="{color}"{opacity} stroke-width="{_n(width)}"/>')
@@ -4,7 +4,13 @@ Logo and App Color Fixer for LumiChat
 Fixes logo colors to perfectly match app theme and creates optimized versions
 """
 
-from PIL import Image, ImageEnhance, ImageFilter, ImageOps
+from PIL import Image, ImageFilter
+from layer_cache import LAYER_CACHE
+from pixel_buffer import COPY_TRACKER, PixelBuffer, as_buffer, shared_buffer
+from render_pipeline import wants, write_to_disk
+from render_shards import add_build_arguments, build, zip_or_check
+import argparse
+import numpy as np
 import os
 import colorsys
 
@@ -39,164 +45,246 @@ def adjust_color_to_theme(pixel, theme_hue, saturation_boost=1.5, lightness_adju
     
     return (new_r, new_g, new_b, alpha) if len(pixel) == 4 else (new_r, new_g, new_b)
 
-def create_theme_matched_logo():
-    """Create logo with perfect theme color matching"""
-    
-    # App theme colors
-    primary_color = (20, 184, 166)  # #14B8A6 - Teal
-    secondary_color = (139, 92, 246)  # #8B5CF6 - Purple
+def recolor_pixels(pixels, theme_hue, saturation_boost=1.5, lightness_adjust=0):
+    """Shift an H x W x 3/4 uint8 array to the theme hue, in place"""
+    channels = pixels.shape[2]
+    packed = np.zeros(pixels.shape[:2], dtype=np.uint32)
+    for channel in range(channels):
+        packed = packed << 8 | pixels[..., channel]
     
-    # Get theme hue from primary color
-    theme_hue = rgb_to_hsl(*primary_color)[0]
+    # Logos use few distinct colors, so convert each one only once
+    colors, inverse = np.unique(packed.ravel(), return_inverse=True)
+    shifts = [8 * (channels - 1 - channel) for channel in range(channels)]
+    adjusted = np.array([
+        adjust_color_to_theme(tuple(int(color) >> shift & 255 for shift in shifts),
+                              theme_hue, saturation_boost, lightness_adjust)
+        for color in colors
+    ], dtype=np.uint8)
+    pixels[...] = adjusted[inverse].reshape(pixels.shape)
+
+def recolor_to_theme(img, theme_hue, saturation_boost=1.5, lightness_adjust=0):
+    """Shift every visible pixel of a PixelBuffer or RGB/RGBA image to the theme hue, in place"""
+    buffer = img if isinstance(img, PixelBuffer) else shared_buffer(img)
+    if buffer is not None:
+        recolor_pixels(buffer.array, theme_hue, saturation_boost, lightness_adjust)
+        return img
     
-    # Load the base logo
+    # Plain PIL image: round-trip through an array
+    pixels = np.array(img)
+    COPY_TRACKER.record("recolor_image", pixels.nbytes * 2)
+    recolor_pixels(pixels, theme_hue, saturation_boost, lightness_adjust)
+    img.paste(Image.fromarray(pixels))
+    return img
+
+def _luma(pixels):
+    """ITU-R 601-2 luma exactly as PIL's convert("L") computes it"""
+    r, g, b = (pixels[..., channel].astype(np.uint32) for channel in range(3))
+    return (r * 19595 + g * 38470 + b * 7471 + 0x8000) >> 16
+
+def _blend_rgb(pixels, degenerate, factor):
+    """PIL's Image.blend(degenerate, image, factor) on the RGB channels, in place"""
+    # Float32 throughout, like PIL; mixing in integer arrays would promote to float64
+    rgb = pixels[..., :3].astype(np.float32)
+    degenerate = np.asarray(degenerate, dtype=np.float32)
+    out = degenerate + np.float32(factor) * (rgb - degenerate)
+    pixels[..., :3] = np.clip(out, 0, 255).astype(np.uint8)
+
+def enhance_contrast(buffer, factor):
+    """In-place ImageEnhance.Contrast(image).enhance(factor) for a PixelBuffer"""
+    mean = int(_luma(buffer.array).mean() + 0.5)
+    _blend_rgb(buffer.array, mean, factor)
+    return buffer
+
+def enhance_color(buffer, factor):
+    """In-place ImageEnhance.Color(image).enhance(factor) for a PixelBuffer"""
+    gray = _luma(buffer.array)[..., None]
+    _blend_rgb(buffer.array, gray, factor)
+    return buffer
+
+def resize(buffer, size):
+    """High quality resize into a new PixelBuffer"""
+    return PixelBuffer.from_image(buffer.to_image().resize(size, Image.Resampling.LANCZOS), "resize")
+
+THEME_PRIMARY = (20, 184, 166)  # #14B8A6 - Teal
+THEME_SECONDARY = (139, 92, 246)  # #8B5CF6 - Purple
+
+# Theme-matched logo sizes (width, height, suffix)
+THEME_MATCHED_SIZES = [
+    (150, 150, "splash_small"),
+    (200, 200, "splash_medium"), 
+    (280, 280, "splash_large"),
+    (350, 350, "splash_xl"),
+    (500, 500, "ultra_hd"),
+    (1024, 1024, "xxl")
+]
+
+# Android icon sizes (enhanced for better visibility)
+ANDROID_ICON_SIZES = [
+    ("mdpi", 56),      # Enhanced from 48
+    ("hdpi", 84),      # Enhanced from 72  
+    ("xhdpi", 112),    # Enhanced from 96
+    ("xxhdpi", 168),   # Enhanced from 144
+    ("xxxhdpi", 224),  # Enhanced from 192
+]
+
+def load_base_logo():
+    """Load the source logo the theme generators work from"""
     logo_path = "assets/images/luminachat-tempo-logo.png"
     if not os.path.exists(logo_path):
         logo_path = "assets/images/logo.png"
     
     print(f"Loading logo from: {logo_path}")
-    base_logo = Image.open(logo_path).convert("RGBA")
+    with Image.open(logo_path) as img:
+        return PixelBuffer.from_image(img, "decode")
+
+def iter_theme_matched_logo(include=None, base_logo=None):
+    """Lazily render theme-matched logo sizes as (target_name, image, metadata)"""
     
-    # Create enhanced versions
-    sizes = [
-        (150, 150, "splash_small"),
-        (200, 200, "splash_medium"), 
-        (280, 280, "splash_large"),
-        (350, 350, "splash_xl"),
-        (500, 500, "ultra_hd"),
-        (1024, 1024, "xxl")
-    ]
+    # Get theme hue from primary color
+    theme_hue = rgb_to_hsl(*THEME_PRIMARY)[0]
     
-    for width, height, suffix in sizes:
-        print(f"Creating {suffix} version ({width}x{height})...")
+    for width, height, suffix in THEME_MATCHED_SIZES:
+        target_name = f"assets/images/logo_{suffix}.png"
+        if not wants(include, target_name):
+            continue
+        
+        # Only decode the source once something actually needs rendering
+        if base_logo is None:
+            base_logo = load_base_logo()
         
         # Resize with high quality
-        logo = base_logo.resize((width, height), Image.Resampling.LANCZOS)
+        logo = resize(as_buffer(base_logo), (width, height))
         
         # Enhance colors to match theme
-        pixels = logo.load()
-        for y in range(logo.height):
-            for x in range(logo.width):
-                pixel = pixels[x, y]
-                pixels[x, y] = adjust_color_to_theme(pixel, theme_hue, 1.8, 0.1)
+        recolor_to_theme(logo, theme_hue, 1.8, 0.1)
         
         # Enhance contrast and vibrancy
-        enhancer = ImageEnhance.Contrast(logo)
-        logo = enhancer.enhance(1.4)
-        
-        enhancer = ImageEnhance.Color(logo)
-        logo = enhancer.enhance(1.6)
+        enhance_contrast(logo, 1.4)
+        enhance_color(logo, 1.6)
         
         # Add subtle glow effect for larger sizes
         if width >= 280:
-            # Create glow layer
-            glow = logo.copy()
-            glow = glow.filter(ImageFilter.GaussianBlur(radius=8))
+            # Create glow layer (the blur reads the logo without copying it)
+            glow = logo.to_image().filter(ImageFilter.GaussianBlur(radius=8))
             
             # Composite glow with original
-            final_logo = Image.new("RGBA", logo.size)
-            final_logo = Image.alpha_composite(final_logo, glow)
-            final_logo = Image.alpha_composite(final_logo, logo)
+            final_logo = PixelBuffer.new(logo.size)
+            final_logo.alpha_composite(glow)
+            final_logo.alpha_composite(logo)
             logo = final_logo
         
-        # Save the enhanced logo
-        output_path = f"assets/images/logo_{suffix}.png"
-        logo.save(output_path, "PNG", optimize=True, quality=100)
-        print(f"✅ Saved: {output_path}")
+        metadata = {
+            "suffix": suffix,
+            "size": (width, height),
+            "format": "PNG",
+            "save_args": {"optimize": True, "quality": 100},
+        }
+        yield target_name, logo, metadata
 
-def create_themed_android_icons():
-    """Create Android app icons with perfect theme integration"""
+def create_theme_matched_logo(include=None):
+    """Create logo with perfect theme color matching"""
+    for _, path, metadata in write_to_disk(iter_theme_matched_logo(include)):
+        width, height = metadata["size"]
+        print(f"✅ Saved: {path} ({width}x{height})")
+
+def render_android_icon_background(size, primary_color, secondary_color):
+    """Render the rounded gradient tile behind the Android launcher logo as a PixelBuffer"""
     
-    # Load base logo
-    logo_path = "assets/images/luminachat-tempo-logo.png"
-    if not os.path.exists(logo_path):
-        logo_path = "assets/images/logo.png"
+    # Create background with gradient
+    background = PixelBuffer.new((size, size))
+    y, x = np.mgrid[0:size, 0:size]
     
-    base_logo = Image.open(logo_path).convert("RGBA")
+    # Calculate gradient position
+    progress = (x + y) / (size * 2)
     
-    # App theme colors
-    primary_color = (20, 184, 166)  # #14B8A6 - Teal
-    secondary_color = (139, 92, 246)  # #8B5CF6 - Purple
+    # Interpolate between primary and secondary colors
+    for channel in range(3):
+        start = primary_color[channel]
+        background.array[..., channel] = np.trunc(start + (secondary_color[channel] - start) * progress)
     
-    # Android icon sizes (enhanced for better visibility)
-    icon_sizes = [
-        ("mdpi", 56),      # Enhanced from 48
-        ("hdpi", 84),      # Enhanced from 72  
-        ("xhdpi", 112),    # Enhanced from 96
-        ("xxhdpi", 168),   # Enhanced from 144
-        ("xxxhdpi", 224),  # Enhanced from 192
-    ]
+    # Add rounded corners for modern look
+    corner_radius = size // 5
+    far = size - corner_radius
+    distance_from_corner = np.full((size, size), np.inf)
+    for in_corner, corner_x, corner_y in (
+        ((x < corner_radius) & (y < corner_radius), corner_radius, corner_radius),
+        ((x > far) & (y < corner_radius), far, corner_radius),
+        ((x < corner_radius) & (y > far), corner_radius, far),
+        ((x > far) & (y > far), far, far),
+    ):
+        distance = np.sqrt((x - corner_x) ** 2 + (y - corner_y) ** 2)
+        distance_from_corner = np.where(in_corner, np.minimum(distance_from_corner, distance), distance_from_corner)
     
-    for density, size in icon_sizes:
-        print(f"Creating Android icon for {density} ({size}x{size})...")
-        
-        # Create background with gradient
-        background = Image.new("RGBA", (size, size))
-        
-        # Create gradient background
-        for y in range(size):
-            for x in range(size):
-                # Calculate gradient position
-                progress = ((x + y) / (size * 2))
-                
-                # Interpolate between primary and secondary colors
-                r = int(primary_color[0] + (secondary_color[0] - primary_color[0]) * progress)
-                g = int(primary_color[1] + (secondary_color[1] - primary_color[1]) * progress)
-                b = int(primary_color[2] + (secondary_color[2] - primary_color[2]) * progress)
-                
-                background.putpixel((x, y), (r, g, b, 255))
+    inside = ((distance_from_corner < corner_radius)
+              | ((x >= corner_radius) & (x < far))
+              | ((y >= corner_radius) & (y < far)))
+    
+    # Apply rounded corners to background
+    background.array[..., 3] = np.where(inside, 255, 0)
+    
+    return background
+
+def iter_themed_android_icons(include=None, base_logo=None,
+                              primary_color=THEME_PRIMARY, secondary_color=THEME_SECONDARY):
+    """Lazily render themed Android launcher icons as (target_name, image, metadata)"""
+    
+    for density, size in ANDROID_ICON_SIZES:
+        target_name = f"android/app/src/main/res/mipmap-{density}/ic_launcher.png"
+        if not wants(include, target_name):
+            continue
         
-        # Add rounded corners for modern look
-        mask = Image.new("L", (size, size), 0)
-        for y in range(size):
-            for x in range(size):
-                # Calculate distance from corners
-                corner_radius = size // 5
-                distance_from_corner = min(
-                    ((x - corner_radius)**2 + (y - corner_radius)**2)**0.5 if x < corner_radius and y < corner_radius else float('inf'),
-                    ((x - (size - corner_radius))**2 + (y - corner_radius)**2)**0.5 if x > size - corner_radius and y < corner_radius else float('inf'),
-                    ((x - corner_radius)**2 + (y - (size - corner_radius))**2)**0.5 if x < corner_radius and y > size - corner_radius else float('inf'),
-                    ((x - (size - corner_radius))**2 + (y - (size - corner_radius))**2)**0.5 if x > size - corner_radius and y > size - corner_radius else float('inf')
-                )
-                
-                if distance_from_corner < corner_radius or (x >= corner_radius and x < size - corner_radius) or (y >= corner_radius and y < size - corner_radius):
-                    mask.putpixel((x, y), 255)
+        if base_logo is None:
+            base_logo = load_base_logo()
         
-        # Apply rounded corners to background
-        background.putalpha(mask)
+        # Gradient tile with rounded corners (shared by themes with the same colors)
+        background = LAYER_CACHE.get(
+            "android_icon_background", size, (primary_color, secondary_color),
+            lambda: render_android_icon_background(size, primary_color, secondary_color),
+            copy=False
+        )
         
         # Resize and overlay logo
         logo_size = int(size * 0.7)  # Logo takes 70% of icon space
         logo_offset = (size - logo_size) // 2
         
-        logo_resized = base_logo.resize((logo_size, logo_size), Image.Resampling.LANCZOS)
+        logo_resized = resize(as_buffer(base_logo), (logo_size, logo_size))
         
         # Enhance logo colors
         theme_hue = rgb_to_hsl(*primary_color)[0]
-        pixels = logo_resized.load()
-        for y in range(logo_resized.height):
-            for x in range(logo_resized.width):
-                pixel = pixels[x, y]
-                if len(pixel) == 4 and pixel[3] > 0:  # Non-transparent
-                    pixels[x, y] = adjust_color_to_theme(pixel, theme_hue, 2.0, 0.2)
+        recolor_to_theme(logo_resized, theme_hue, 2.0, 0.2)
         
         # Add white stroke around logo for contrast
-        stroke_logo = ImageOps.expand(logo_resized, border=2, fill=(255, 255, 255, 200))
         stroke_size = logo_size + 4
+        stroke_logo = PixelBuffer.new((stroke_size, stroke_size), (255, 255, 255, 200))
+        stroke_logo.paste(logo_resized, (2, 2))
         stroke_offset = (size - stroke_size) // 2
         
-        # Composite final icon
-        final_icon = background.copy()
-        final_icon.paste(stroke_logo, (stroke_offset, stroke_offset), stroke_logo)
-        final_icon.paste(logo_resized, (logo_offset, logo_offset), logo_resized)
-        
-        # Save icon
-        icon_dir = f"android/app/src/main/res/mipmap-{density}"
-        os.makedirs(icon_dir, exist_ok=True)
+        # Composite final icon (the cached background is shared, so copy it once)
+        final_icon = background.copy("android_background")
+        icon_image = final_icon.to_image()
+        stroke_image = stroke_logo.to_image()
+        logo_image = logo_resized.to_image()
+        icon_image.paste(stroke_image, (stroke_offset, stroke_offset), stroke_image)
+        icon_image.paste(logo_image, (logo_offset, logo_offset), logo_image)
         
-        output_path = f"{icon_dir}/ic_launcher.png"
-        final_icon.save(output_path, "PNG", optimize=True, quality=100)
-        print(f"✅ Saved Android icon: {output_path}")
+        metadata = {
+            "density": density,
+            "size": (size, size),
+            "format": "PNG",
+            "save_args": {"optimize": True, "quality": 100},
+        }
+        yield target_name, final_icon, metadata
+
+def create_themed_android_icons(include=None):
+    """Create Android app icons with perfect theme integration"""
+    for _, path, metadata in write_to_disk(iter_themed_android_icons(include)):
+        size = metadata["size"][0]
+        print(f"✅ Saved Android icon for {metadata['density']} ({size}x{size}): {path}")
+
+def iter_theme_assets(include=None):
+    """Lazily render the theme-matched logos and the themed Android icons"""
+    yield from iter_theme_matched_logo(include)
+    yield from iter_themed_android_icons(include)
 
 def update_app_constants():
     """Update app constants with theme-matched assets"""
@@ -224,15 +312,26 @@ def main():
     print("🚀 LumiChat Logo & Color Fixer")
     print("=" * 50)
     
+    parser = add_build_arguments(argparse.ArgumentParser(description="Theme-match the LumiChat logo and icons"))
+    args = parser.parse_args()
+    # Paths given on the command line are relative to the caller, like the other entry points
+    args.timings = os.path.abspath(args.timings)
+    args.manifest_dir = os.path.abspath(args.manifest_dir)
+    if args.zip:
+        args.zip = os.path.abspath(args.zip)
+    
     try:
-        # Change to project directory
-        os.chdir("e:/luminachat-2.0")
+        # Change to project directory (the folder this script lives in)
+        os.chdir(os.path.dirname(os.path.abspath(__file__)))
         
-        print("📱 Creating theme-matched logo versions...")
-        create_theme_matched_logo()
+        if args.zip or args.check:
+            return zip_or_check(iter_theme_assets, args)
         
-        print("\n🤖 Creating themed Android app icons...")
-        create_themed_android_icons()
+        print("📱 Creating theme-matched logos and themed Android app icons...")
+        for _, path, metadata in build("logo_color_fixer", iter_theme_assets, args.shard,
+                                       args.timings, args.manifest_dir, only=args.only):
+            width, height = metadata["size"]
+            print(f"✅ Saved: {path} ({width}x{height})")
         
         print("\n⚙️  Updating app constants...")
         update_app_constants()
@@ -246,6 +345,9 @@ def main():
         print("• Android icons with gradient backgrounds")
         print("• Subtle glow effects for premium look")
         print("• Rounded corners with white stroke for visibility")
+        print(f"\n🧱 {LAYER_CACHE.summary()}")
+        if COPY_TRACKER.enabled:
+            print(f"📋 {COPY_TRACKER.summary()}")
         
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+LumiChat Sprite Atlas Packer
+Bin-packs the small bundled PNGs into power-of-two sheets so the app decodes a
+sheet or two at startup instead of one file per logo size
+
+    python pack_sprite_atlas.py
+    python pack_sprite_atlas.py --max-sprite 128 --padding 4 --extrude 2 --full
+
+Sprites are placed with MaxRects (best short side fit); each keeps `padding`
+transparent pixels from its neighbours and has its edge pixels extruded by
+`extrude` so filtered sampling never bleeds in. The sheets, a JSON index and a
+Dart index of sprite rects are written next to the app sources.
+
+Repacking is incremental: the previous index records every sprite's hash, so
+an asset whose pixels changed but whose size did not is re-blitted into its
+existing slot, and added or resized assets go into free space on the existing
+sheets. Only sheets that changed are re-encoded. A full repack happens when the
+settings change, a sheet is missing, or it would need fewer sheets.
+"""
+
+from PIL import Image
+from pixel_buffer import PixelBuffer
+import argparse
+import hashlib
+import json
+import numpy as np
+import os
+import re
+
+ASSET_DIRS = ["assets/images", "assets/icons"]
+OUTPUT_DIR = "assets/images"
+INDEX_NAME = "atlas.json"
+DART_INDEX_PATH = "lib/core/utils/sprite_atlas.dart"
+
+# Packer outputs in the output directory, never packed themselves
+SHEET_PATTERN = re.compile(r"^atlas_\d+\.png$")
+
+DEFAULT_MAX_SIZE = 2048
+DEFAULT_MAX_SPRITE = 256
+DEFAULT_PADDING = 2
+DEFAULT_EXTRUDE = 1
+
+class MaxRectsBin:
+    """Free space of one sheet as maximal free rectangles (x, y, width, height)"""
+
+    def __init__(self, width, height):
+        self.free = [(0, 0, width, height)]
+
+    def find(self, width, height):
+        """Best short side fit position for a width x height rect, or None"""
+        best = None
+        for fx, fy, fw, fh in self.free:
+            if width <= fw and height <= fh:
+                leftover_x, leftover_y = fw - width, fh - height
+                score = (min(leftover_x, leftover_y), max(leftover_x, leftover_y), fy, fx)
+                if best is None or score < best[0]:
+                    best = (score, (fx, fy))
+        return best[1] if best else None
+
+    def insert(self, width, height):
+        """Place a rect at the best fit and return its position, or None if it does not fit"""
+        position = self.find(width, height)
+        if position is not None:
+            self.occupy((*position, width, height))
+        return position
+
+    def occupy(self, rect):
+        """Mark a rect as used, splitting every free rect it overlaps"""
+        x, y, width, height = rect
+        right, bottom = x + width, y + height
+        split = []
+        for free in self.free:
+            fx, fy, fw, fh = free
+            free_right, free_bottom = fx + fw, fy + fh
+            if x >= free_right or right <= fx or y >= free_bottom or bottom <= fy:
+                split.append(free)
+                continue
+            # Up to four maximal rects around the used one
+            if x > fx:
+                split.append((fx, fy, x - fx, fh))
+            if right < free_right:
+                split.append((right, fy, free_right - right, fh))
+            if y > fy:
+                split.append((fx, fy, fw, y - fy))
+            if bottom < free_bottom:
+                split.append((fx, bottom, fw, free_bottom - bottom))
+        self.free = [free for index, free in enumerate(split)
+                     if not any(_contains(other, free) and (other != free or other_index < index)
+                                for other_index, other in enumerate(split) if other_index != index)]
+
+def _contains(outer, inner):
+    """Whether rect outer fully covers rect inner"""
+    return (outer[0] <= inner[0] and outer[1] <= inner[1]
+            and outer[0] + outer[2] >= inner[0] + inner[2] and outer[1] + outer[3] >= inner[1] + inner[3])
+
+def list_sprites(asset_dirs=ASSET_DIRS, max_sprite=DEFAULT_MAX_SPRITE):
+    """Small bundled PNGs as {path: (width, height)}, reading only their headers"""
+    sprites = {}
+    for asset_dir in asset_dirs:
+        if not os.path.isdir(asset_dir):
+            continue
+        # Flutter bundles the files directly inside a listed directory, not subdirectories
+        for name in sorted(os.listdir(asset_dir)):
+            path = f"{asset_dir}/{name}"
+            if not name.lower().endswith(".png") or SHEET_PATTERN.match(name) or not os.path.isfile(path):
+                continue
+            with Image.open(path) as img:
+                if max(img.size) <= max_sprite:
+                    sprites[path] = img.size
+    return sprites
+
+def file_digest(path):
+    """sha256 of a file's bytes"""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def slot_size(width, height, padding, extrude):
+    """Space a sprite takes in a bin: its extruded edges plus padding on one side"""
+    return width + 2 * extrude + padding, height + 2 * extrude + padding
+
+def slot_rect(sprite, padding, extrude):
+    """The bin rect (x, y, width, height) an indexed sprite occupies"""
+    return (sprite["x"] - extrude, sprite["y"] - extrude,
+            *slot_size(sprite["width"], sprite["height"], padding, extrude))
+
+def packing_order(sprites):
+    """Longest side first, then largest area, then path for stable output"""
+    return sorted(sprites.items(), key=lambda item: (-max(item[1]), -item[1][0] * item[1][1], item[0]))
+
+def pack_sheet(size, sprites, padding, extrude, occupied=()):
+    """Place as many (path, (width, height)) sprites as fit on one sheet
+
+    The bin is `padding` larger than the sheet, so padding only separates
+    sprites and is never spent on the sheet's right and bottom edges.
+    Returns ({path: (x, y)} sprite positions, unplaced sprites).
+    """
+    free_space = MaxRectsBin(size[0] + padding, size[1] + padding)
+    for rect in occupied:
+        free_space.occupy(rect)
+    placed = {}
+    leftover = []
+    for path, (width, height) in sprites:
+        position = free_space.insert(*slot_size(width, height, padding, extrude))
+        if position is None:
+            leftover.append((path, (width, height)))
+        else:
+            placed[path] = (position[0] + extrude, position[1] + extrude)
+    return placed, leftover
+
+def sheet_sizes(sprites, max_size, padding, extrude):
+    """Power-of-two sheet sizes with room for all sprites' slots, smallest and squarest first"""
+    slots = [slot_size(width, height, padding, extrude) for _, (width, height) in sprites]
+    area = sum(width * height for width, height in slots)
+    min_width = max(width for width, _ in slots) - padding
+    min_height = max(height for _, height in slots) - padding
+    powers = [1 << shift for shift in range(max_size.bit_length())]
+    candidates = [(width, height) for width in powers for height in powers
+                  if width >= min_width and height >= min_height
+                  and (width + padding) * (height + padding) >= area]
+    return sorted(candidates, key=lambda size: (size[0] * size[1], max(size) // min(size), -size[0]))
+
+def pack_sheets(sprites, max_size, padding, extrude):
+    """Pack sprites from scratch into the fewest, smallest power-of-two sheets
+
+    Returns a list of (sheet size, {path: (x, y)}).
+    """
+    remaining = packing_order(sprites)
+    sheets = []
+    while remaining:
+        for size in sheet_sizes(remaining, max_size, padding, extrude):
+            placed, leftover = pack_sheet(size, remaining, padding, extrude)
+            if not leftover:
+                break
+        else:
+            # Too much for one sheet: fill a full-size one and carry on with the rest
+            size = (max_size, max_size)
+            placed, leftover = pack_sheet(size, remaining, padding, extrude)
+        if not placed:
+            raise ValueError(f"{remaining[0][0]} does not fit a {max_size}x{max_size} sheet")
+        sheets.append((size, placed))
+        remaining = leftover
+    return sheets
+
+def new_sheet_changes():
+    """Per-sheet work list for render_sheets"""
+    return {"new": False, "clear": [], "blit": []}
+
+def full_layout(sprites, digests, settings, out_dir):
+    """Index and sheet changes for packing every sprite from scratch"""
+    index = {"settings": settings, "sheets": [], "sprites": {}}
+    changes = {}
+    for number, (size, placed) in enumerate(pack_sheets(sprites, settings["max_size"], settings["padding"],
+                                                          settings["extrude"])):
+        index["sheets"].append({"image": f"{out_dir}/atlas_{number}.png", "width": size[0], "height": size[1]})
+        changes[number] = {"new": True, "clear": [], "blit": sorted(placed)}
+        for path, (x, y) in placed.items():
+            index["sprites"][path] = _sprite_entry(number, x, y, sprites[path], digests[path])
+    index["sprites"] = dict(sorted(index["sprites"].items()))
+    return index, changes
+
+def _sprite_entry(sheet, x, y, size, digest):
+    return {"sheet": sheet, "x": x, "y": y, "width": size[0], "height": size[1], "sha256": digest}
+
+def incremental_layout(previous, sprites, digests, settings, out_dir):
+    """Update the previous index in place of a full repack
+
+    Returns (index, changes) touching only the sheets that differ, or None when
+    a full repack is needed.
+    """
+    if not previous or previous.get("settings") != settings:
+        return None
+    for sheet in previous["sheets"]:
+        if not os.path.exists(sheet["image"]):
+            return None
+        with Image.open(sheet["image"]) as img:
+            if img.size != (sheet["width"], sheet["height"]):
+                return None
+
+    padding, extrude = settings["padding"], settings["extrude"]
+    index = {"settings": settings, "sheets": [dict(sheet) for sheet in previous["sheets"]], "sprites": {}}
+    changes = {number: new_sheet_changes() for number in range(len(index["sheets"]))}
+
+    # Same-size sprites keep their slot; pixel changes are re-blitted there
+    pending = {}
+    for path, size in sprites.items():
+        old = previous["sprites"].get(path)
+        if old is not None and (old["width"], old["height"]) == size:
+            index["sprites"][path] = dict(old, sha256=digests[path])
+            if old["sha256"] != digests[path]:
+                changes[old["sheet"]]["blit"].append(path)
+        else:
+            pending[path] = size
+
+    # Removed and resized sprites free their slot
+    for path, old in previous["sprites"].items():
+        if path not in index["sprites"]:
+            changes[old["sheet"]]["clear"].append(old)
+
+    # New and resized sprites go into free space on the existing sheets first
+    remaining = packing_order(pending)
+    for number, sheet in enumerate(index["sheets"]):
+        if not remaining:
+            break
+        occupied = [slot_rect(sprite, padding, extrude) for sprite in index["sprites"].values()
+                    if sprite["sheet"] == number]
+        placed, remaining = pack_sheet((sheet["width"], sheet["height"]), remaining, padding, extrude, occupied)
+        for path, (x, y) in placed.items():
+            index["sprites"][path] = _sprite_entry(number, x, y, sprites[path], digests[path])
+            changes[number]["blit"].append(path)
+
+    if remaining:
+        extra = pack_sheets(dict(remaining), settings["max_size"], padding, extrude)
+        # Spilling onto new sheets is only worth it if packing from scratch would not be smaller
+        if len(index["sheets"]) + len(extra) > len(pack_sheets(sprites, settings["max_size"], padding, extrude)):
+            return None
+        for size, placed in extra:
+            number = len(index["sheets"])
+            index["sheets"].append({"image": f"{out_dir}/atlas_{number}.png", "width": size[0], "height": size[1]})
+            changes[number] = {"new": True, "clear": [], "blit": sorted(placed)}
+            for path, (x, y) in placed.items():
+                index["sprites"][path] = _sprite_entry(number, x, y, sprites[path], digests[path])
+
+    index["sprites"] = dict(sorted(index["sprites"].items()))
+    return index, {number: change for number, change in changes.items()
+                   if change["new"] or change["clear"] or change["blit"]}
+
+def extruded_box(sprite, extrude):
+    """Sheet box (left, top, right, bottom) of a sprite and its extruded edges"""
+    return (sprite["x"] - extrude, sprite["y"] - extrude,
+            sprite["x"] + sprite["width"] + extrude, sprite["y"] + sprite["height"] + extrude)
+
+def blit_sprite(sheet, path, sprite, extrude):
+    """Copy a sprite into its slot, repeating its edge pixels outward by extrude"""
+    with Image.open(path) as img:
+        pixels = np.asarray(img.convert("RGBA"))
+    sheet.crop(extruded_box(sprite, extrude)).array[...] = np.pad(
+        pixels, ((extrude, extrude), (extrude, extrude), (0, 0)), mode="edge")
+
+def render_sheets(index, changes):
+    """Write every changed sheet, editing existing sheets in place"""
+    extrude = index["settings"]["extrude"]
+    written = []
+    for number, change in sorted(changes.items()):
+        sheet = index["sheets"][number]
+        if change["new"]:
+            buffer = PixelBuffer.new((sheet["width"], sheet["height"]))
+        else:
+            with Image.open(sheet["image"]) as existing:
+                buffer = PixelBuffer.from_image(existing, "atlas_sheet")
+        # Clear freed slots first: a re-placed sprite may land on one
+        for sprite in change["clear"]:
+            buffer.crop(extruded_box(sprite, extrude)).array[...] = 0
+        for path in change["blit"]:
+            blit_sprite(buffer, path, index["sprites"][path], extrude)
+        buffer.save(sheet["image"], "PNG", optimize=True)
+        written.append(sheet["image"])
+    return written
+
+def load_index(index_path):
+    """Load the previous atlas index, or None"""
+    if not os.path.exists(index_path):
+        return None
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def dart_index(index):
+    """Dart source mirroring the JSON index, for drawing sprites without parsing it"""
+    lines = [
+        "// Generated by pack_sprite_atlas.py - do not edit by hand.",
+        "import 'dart:ui';",
+        "",
+        "// A sprite's rect on one of the atlas sheets",
+        "class AtlasSprite {",
+        "  final int sheet;",
+        "  final Rect rect;",
+        "",
+        "  const AtlasSprite(this.sheet, this.rect);",
+        "}",
+        "",
+        "// Small images packed into shared sheets, keyed by their original asset path",
+        "class SpriteAtlas {",
+        "  static const List<String> sheets = [",
+    ]
+    lines += [f"    '{sheet['image']}'," for sheet in index["sheets"]]
+    lines += [
+        "  ];",
+        "",
+        "  static const Map<String, AtlasSprite> sprites = {",
+    ]
+    for path, sprite in index["sprites"].items():
+        lines.append(f"    '{path}': AtlasSprite({sprite['sheet']}, "
+                     f"Rect.fromLTWH({sprite['x']}, {sprite['y']}, {sprite['width']}, {sprite['height']})),")
+    lines += ["  };", "}", ""]
+    return "\n".join(lines)
+
+def write_if_changed(path, text):
+    """Write text unless the file already holds it; returns whether it was written"""
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == text:
+                return False
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return True
+
+def packing_report(index):
+    """Per-sheet and overall efficiency: sprite pixels over sheet pixels"""
+    used = [0] * len(index["sheets"])
+    counts = [0] * len(index["sheets"])
+    for sprite in index["sprites"].values():
+        used[sprite["sheet"]] += sprite["width"] * sprite["height"]
+        counts[sprite["sheet"]] += 1
+    sheets = [{"image": sheet["image"], "width": sheet["width"], "height": sheet["height"],
+               "sprites": count, "used_pixels": pixels,
+               "efficiency": pixels / (sheet["width"] * sheet["height"])}
+              for sheet, count, pixels in zip(index["sheets"], counts, used)]
+    total_area = sum(sheet["width"] * sheet["height"] for sheet in index["sheets"])
+    return {
+        "sheets": sheets,
+        "used_pixels": sum(used),
+        "sheet_pixels": total_area,
+        "efficiency": sum(used) / total_area if total_area else 0.0,
+    }
+
+def format_bytes(count):
+    """Human-readable byte count"""
+    for unit in ("B", "KB", "MB"):
+        if count < 1024 or unit == "MB":
+            return f"{count:.1f} {unit}" if unit != "B" else f"{count} {unit}"
+        count /= 1024
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack small LumiChat assets into sprite atlas sheets")
+    parser.add_argument("--max-size", type=int, default=DEFAULT_MAX_SIZE,
+                        help="largest sheet side (a power of two)")
+    parser.add_argument("--max-sprite", type=int, default=DEFAULT_MAX_SPRITE,
+                        help="only pack images whose longest side is at most this")
+    parser.add_argument("--padding", type=int, default=DEFAULT_PADDING, help="transparent pixels between sprites")
+    parser.add_argument("--extrude", type=int, default=DEFAULT_EXTRUDE, help="edge pixels repeated around sprites")
+    parser.add_argument("--full", action="store_true", help="repack from scratch instead of incrementally")
+    parser.add_argument("--out-dir", default=OUTPUT_DIR, help="directory for the sheets and JSON index")
+    parser.add_argument("--dart-out", default=DART_INDEX_PATH, help="generated Dart index")
+    args = parser.parse_args()
+
+    if args.max_size < 1 or args.max_size & (args.max_size - 1):
+        parser.error("--max-size must be a power of two")
+    if args.padding < 0 or args.extrude < 0:
+        parser.error("--padding and --extrude must not be negative")
+    if args.max_sprite + 2 * args.extrude > args.max_size:
+        parser.error("--max-sprite plus extrusion must fit within --max-size")
+
+    print("📦 LumiChat Sprite Atlas Packer")
+    sprites = list_sprites(ASSET_DIRS, args.max_sprite)
+    if not sprites:
+        print(f"   No PNGs of {args.max_sprite}px or less in {', '.join(ASSET_DIRS)}")
+        return 0
+    print(f"   {len(sprites)} sprites of {args.max_sprite}px or less from {', '.join(ASSET_DIRS)}")
+    print()
+
+    settings = {"max_size": args.max_size, "max_sprite": args.max_sprite,
+                "padding": args.padding, "extrude": args.extrude}
+    digests = {path: file_digest(path) for path in sprites}
+    index_path = os.path.join(args.out_dir, INDEX_NAME)
+    previous = load_index(index_path)
+
+    planned = None if args.full else incremental_layout(previous, sprites, digests, settings, args.out_dir)
+    if planned is None:
+        index, changes = full_layout(sprites, digests, settings, args.out_dir)
+        print("🔁 Full repack")
+    else:
+        index, changes = planned
+        if changes:
+            blits = sum(len(change["blit"]) for change in changes.values())
+            clears = sum(len(change["clear"]) for change in changes.values())
+            print(f"♻️  Incremental: {blits} sprite(s) blitted, {clears} slot(s) freed")
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    written = render_sheets(index, changes)
+    # Stale sheets from a previous, larger pack
+    for sheet in (previous or {}).get("sheets", [])[len(index["sheets"]):]:
+        if os.path.exists(sheet["image"]):
+            os.remove(sheet["image"])
+            print(f"🗑️  Removed {sheet['image']}")
+
+    report = packing_report(index)
+    for sheet in report["sheets"]:
+        status = "✓" if sheet["image"] in written else "="
+        print(f"{status} {sheet['image']} {sheet['width']}x{sheet['height']} - "
+              f"{sheet['sprites']} sprites, {sheet['efficiency'] * 100:.1f}% used")
+    if write_if_changed(index_path, json.dumps(index, indent=1) + "\n"):
+        print(f"✓ {index_path}")
+    if write_if_changed(args.dart_out, dart_index(index)):
+        print(f"✓ {args.dart_out}")
+    if not written:
+        print("✅ Atlas already up to date")
+
+    sprite_bytes = sum(os.path.getsize(path) for path in sprites)
+    sheet_bytes = sum(os.path.getsize(sheet["image"]) for sheet in index["sheets"])
+    print()
+    print(f"📊 Packing efficiency: {report['efficiency'] * 100:.1f}% "
+          f"({report['used_pixels']:,} of {report['sheet_pixels']:,} sheet pixels hold sprites)")
+    print(f"   Startup: {len(sprites)} files → {len(index['sheets'])} sheet(s), "
+          f"{format_bytes(sprite_bytes)} → {format_bytes(sheet_bytes)} on disk")
+    print(f"   Decoded RGBA: {format_bytes(report['used_pixels'] * 4)} of sprites → "
+          f"{format_bytes(report['sheet_pixels'] * 4)} of sheets")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
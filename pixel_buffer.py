@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+LumiChat Pixel Buffer
+Contiguous RGBA pixel storage backed by a NumPy array that PIL can draw into
+directly, so stages hand one buffer along instead of copying images
+
+PixelBuffer.to_image() maps the array into a PIL image with frombuffer; drawing
+on that image writes straight into the array. Crops and tiles are NumPy views
+and map the same way, so in-place stages on a region never copy it.
+
+Set LUMICHAT_DEBUG_COPIES=1 to count every full pixel copy and the bytes moved.
+"""
+
+from PIL import Image
+from collections import Counter
+import numpy as np
+import os
+import threading
+
+class CopyTracker:
+    """Counts pixel copies by reason (only while enabled)"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.copies = Counter()
+        self.bytes = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, reason, nbytes):
+        """Note one copy of nbytes pixel bytes"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.copies[reason] += 1
+            self.bytes[reason] += nbytes
+
+    def reset(self):
+        """Zero the counters"""
+        with self._lock:
+            self.copies.clear()
+            self.bytes.clear()
+
+    def summary(self):
+        """One-line description of copies made, busiest reason first"""
+        if not self.enabled:
+            return "Pixel copies: not tracked (set LUMICHAT_DEBUG_COPIES=1)"
+        total = sum(self.copies.values())
+        total_bytes = sum(self.bytes.values())
+        reasons = ", ".join(f"{reason} {count}" for reason, count in self.copies.most_common())
+        return (f"Pixel copies: {total} ({total_bytes / 1024 / 1024:.1f} MB)"
+                + (f" - {reasons}" if reasons else ""))
+
+# Shared tracker for the logo generators
+COPY_TRACKER = CopyTracker(os.environ.get("LUMICHAT_DEBUG_COPIES", "") not in ("", "0"))
+
+def _allocate(width, height):
+    """Zeroed RGBA storage; returns (root allocation, height x width x 4 view)
+
+    One slack row at the end lets PIL map any crop with the parent's row stride,
+    since it requires height * stride bytes after the crop's first pixel.
+    """
+    root = np.zeros((height + 1, width, 4), dtype=np.uint8)
+    return root, root[:height]
+
+class PixelBuffer:
+    """RGBA pixels in a NumPy array, convertible to and from PIL without copying"""
+
+    def __init__(self, array, root=None):
+        if array.ndim != 3 or array.shape[2] != 4 or array.dtype != np.uint8:
+            raise ValueError(f"expected a height x width x 4 uint8 array, got {array.shape} {array.dtype}")
+        self.array = array
+        # Contiguous allocation the array lives in, used to map views into PIL
+        if root is None and array.flags.c_contiguous:
+            root = array
+        self._root = root
+
+    @classmethod
+    def new(cls, size, color=(0, 0, 0, 0)):
+        """Allocate a buffer filled with one RGBA color"""
+        root, array = _allocate(*size)
+        if any(color):
+            array[...] = color
+        return cls(array, root)
+
+    @classmethod
+    def from_image(cls, img, reason="from_image"):
+        """Buffer holding an image's pixels
+
+        Images made by to_image() hand back their buffer for free; anything else
+        is converted to RGBA and copied once.
+        """
+        shared = shared_buffer(img)
+        if shared is not None:
+            return shared
+        if img.mode != "RGBA":
+            img = img.convert("RGBA")
+        buffer = cls.new(img.size)
+        buffer.to_image().paste(img)
+        COPY_TRACKER.record(reason, buffer.nbytes)
+        return buffer
+
+    @property
+    def width(self):
+        return self.array.shape[1]
+
+    @property
+    def height(self):
+        return self.array.shape[0]
+
+    @property
+    def size(self):
+        return self.width, self.height
+
+    @property
+    def nbytes(self):
+        return self.width * self.height * 4
+
+    @property
+    def __array_interface__(self):
+        # np.asarray(buffer) and Image.fromarray(buffer) see the same memory
+        return self.array.__array_interface__
+
+    def to_image(self):
+        """PIL image that shares this buffer's memory; drawing on it draws here
+
+        Raises ValueError for views PIL cannot map (a foreign strided array),
+        since drawing on a copy would silently leave this buffer unchanged.
+        """
+        img = self._map()
+        if img is None:
+            raise ValueError(f"{self!r} cannot be mapped into PIL; draw on copy() and paste() it back")
+        return img
+
+    def _map(self):
+        """Writable PIL image over the array with the root's row stride, or None"""
+        if self._root is None or self.array.strides[1:] != (4, 1):
+            return None
+        offset = self.array.__array_interface__["data"][0] - self._root.__array_interface__["data"][0]
+        data = memoryview(self._root.reshape(-1))[offset:]
+        try:
+            img = Image.frombuffer("RGBA", self.size, data, "raw", "RGBA", self.array.strides[0], 1)
+        except ValueError:
+            return None
+        img.readonly = 0
+        img._pixel_buffer = (self, img.im)
+        return img
+
+    def crop(self, box):
+        """View of a region (left, top, right, bottom); writes go to this buffer"""
+        left, top, right, bottom = box
+        return PixelBuffer(self.array[top:bottom, left:right], self._root)
+
+    def tiles(self, tile_size):
+        """Yield (box, view) for tile_size squares covering the buffer"""
+        for top in range(0, self.height, tile_size):
+            for left in range(0, self.width, tile_size):
+                box = (left, top, min(left + tile_size, self.width), min(top + tile_size, self.height))
+                yield box, self.crop(box)
+
+    def copy(self, reason="copy"):
+        """Independent buffer with the same pixels"""
+        buffer = PixelBuffer.new(self.size)
+        buffer.array[...] = self.array
+        COPY_TRACKER.record(reason, self.nbytes)
+        return buffer
+
+    def contiguous(self):
+        """This buffer if it is one block of memory, else a compact copy"""
+        if self.array.flags.c_contiguous:
+            return self
+        return self.copy("contiguous")
+
+    def paste(self, source, xy=(0, 0)):
+        """Overwrite a region with another buffer's pixels, in place"""
+        source = as_buffer(source)
+        x, y = xy
+        self.array[y:y + source.height, x:x + source.width] = source.array
+
+    def alpha_composite(self, source, dest=(0, 0)):
+        """Composite another buffer or image over a region, in place"""
+        img = self._map()
+        if img is None:
+            # Unmappable view: composite a compact copy and write it back
+            scratch = self.copy("composite")
+            scratch.to_image().alpha_composite(as_image(source), dest)
+            self.array[...] = scratch.array
+        else:
+            img.alpha_composite(as_image(source), dest)
+        return self
+
+    def save(self, fp, format=None, **params):
+        """Encode through PIL, without copying the pixels when they can be mapped"""
+        as_image(self).save(fp, format, **params)
+
+    def __repr__(self):
+        return f"<PixelBuffer {self.width}x{self.height}{'' if self.array.flags.c_contiguous else ' view'}>"
+
+def shared_buffer(img):
+    """The PixelBuffer a PIL image from to_image() still draws into, else None"""
+    shared = getattr(img, "_pixel_buffer", None)
+    if shared is not None and shared[1] is img.im:
+        return shared[0]
+    return None
+
+def as_buffer(obj):
+    """PixelBuffer for a buffer or PIL image"""
+    return obj if isinstance(obj, PixelBuffer) else PixelBuffer.from_image(obj)
+
+def as_image(obj):
+    """PIL image for a buffer or PIL image, to read from
+
+    Buffers PIL cannot map come back as a copy, so draw through to_image() instead.
+    """
+    if not isinstance(obj, PixelBuffer):
+        return obj
+    img = obj._map()
+    return img if img is not None else obj.copy("contiguous").to_image()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+LumiChat Render Pipeline
+Consumers for the lazy render generators in the logo scripts
+
+Every generator yields (target_name, image, metadata) tuples. target_name is
+the relative output path, metadata carries at least 'format' and 'save_args'.
+"""
+
+from PIL import Image
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import fnmatch
+import io
+import os
+import zipfile
+
+# How many rendered images may wait on the encoder at once
+DEFAULT_MAX_PENDING = 4
+
+def select_targets(*patterns):
+    """Build a target filter from glob patterns (None keeps everything)"""
+    if not patterns:
+        return None
+    return lambda target_name: any(fnmatch.fnmatch(target_name, p) for p in patterns)
+
+def wants(include, target_name):
+    """Check a target against an optional include filter before rendering it"""
+    return include is None or include(target_name)
+
+def to_working_mode(img):
+    """Convert to RGBA if the image has any transparency, else to RGB
+
+    Alpha bands (LA, PA, RGBA) and tRNS transparency (P, L, RGB) both count.
+    """
+    mode = "RGBA" if img.has_transparency_data else "RGB"
+    return img if img.mode == mode else img.convert(mode)
+
+def encode(image, metadata):
+    """Encode a rendered image to bytes using its metadata"""
+    buffer = io.BytesIO()
+    image.save(buffer, metadata.get("format", "PNG"), **metadata.get("save_args", {}))
+    return buffer.getvalue()
+
+def _bounded_map(func, outputs, workers, max_pending):
+    """Apply func to each output on a thread pool, keeping at most max_pending in flight"""
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for output in outputs:
+            pending.append(pool.submit(func, *output))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def encode_all(outputs, workers=None, max_pending=DEFAULT_MAX_PENDING):
+    """Encode outputs concurrently, yielding (target_name, data, metadata) in order"""
+    def _encode(target_name, image, metadata):
+        return target_name, encode(image, metadata), metadata
+
+    return _bounded_map(_encode, outputs, workers, max_pending)
+
+def write_to_disk(outputs, out_dir=".", workers=None, max_pending=DEFAULT_MAX_PENDING):
+    """Encode and save outputs under out_dir, yielding (target_name, path, metadata) in order"""
+    def _write(target_name, image, metadata):
+        path = os.path.normpath(os.path.join(out_dir, target_name))
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        image.save(path, metadata.get("format", "PNG"), **metadata.get("save_args", {}))
+        return target_name, path, metadata
+
+    return _bounded_map(_write, outputs, workers, max_pending)
+
+def write_zip(outputs, zip_path, workers=None, max_pending=DEFAULT_MAX_PENDING):
+    """Bundle outputs into a zip archive without touching the asset tree"""
+    written = []
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED) as bundle:
+        for target_name, data, _ in encode_all(outputs, workers, max_pending):
+            bundle.writestr(target_name, data)
+            written.append(target_name)
+    return written
+
+def diff_against_disk(outputs, out_dir=".", workers=None, max_pending=DEFAULT_MAX_PENDING):
+    """Yield (target_name, status) for outputs that differ from what is on disk"""
+    for target_name, data, _ in encode_all(outputs, workers, max_pending):
+        path = os.path.join(out_dir, target_name)
+        if not os.path.exists(path):
+            yield target_name, "missing"
+            continue
+        with open(path, "rb") as f:
+            if f.read() == data:
+                continue
+        # Encoder settings can differ byte-for-byte; compare decoded pixels too
+        with Image.open(path) as current, Image.open(io.BytesIO(data)) as rendered:
+            if (current.size != rendered.size
+                    or current.convert("RGBA").tobytes() != rendered.convert("RGBA").tobytes()):
+                yield target_name, "changed"
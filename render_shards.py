@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+LumiChat Sharded Rendering
+Splits a generator's targets across N machines and merges their manifests
+
+Targets are assigned deterministically: heaviest first (using per-target render
+timings from a previous build), ties broken by a stable hash, each going to the
+least-loaded shard. Every shard must see the same timings file to agree.
+
+    python create_premium_logo_v2.py --shard 1/3      # on each machine
+    python render_shards.py merge .render_manifests/create_premium_logo_v2.*.json
+    python render_shards.py local create_premium_logo_v2 --shards 4
+
+Every entry point also takes --only PATTERN to render a subset, --zip PATH to
+bundle its targets without touching the asset tree, and --check to exit 1 if
+the assets on disk are stale.
+
+    python create_premium_logo_v2.py --only '*dpi.png' --check
+
+The timings file, render_timings.json, is committed so that fresh CI machines
+shard with real weights. Builds merge their timings into it; to refresh it
+after adding targets or changing their cost, run every entry point through
+`local` (which merges the shard timings) and commit the result:
+
+    for entry in create_premium_logo_v2 create_professional_logo create_wordmark logo_color_fixer; do
+        python render_shards.py local $entry --shards 2
+    done
+"""
+
+from render_pipeline import diff_against_disk, select_targets, write_to_disk, write_zip
+import argparse
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+TIMINGS_PATH = "render_timings.json"
+MANIFEST_DIR = ".render_manifests"
+
+def parse_shard(value):
+    """Parse 'i/N' (1-based) into (i, N)"""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard must look like 2/4, got {value!r}")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index out of range: {value!r}")
+    return index, count
+
+def add_build_arguments(parser):
+    """Add the shared target selection, sharding and output options to an entry point"""
+    parser.add_argument("--only", action="append", metavar="PATTERN",
+                        help="only render targets matching this glob (repeatable)")
+    parser.add_argument("--shard", type=parse_shard, default=None, metavar="I/N",
+                        help="only render this shard of the targets (1-based)")
+    parser.add_argument("--timings", default=TIMINGS_PATH,
+                        help="per-target render timings used as cost weights")
+    parser.add_argument("--manifest-dir", default=MANIFEST_DIR,
+                        help="where to write this run's manifest")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--zip", metavar="PATH",
+                        help="bundle the targets into a zip instead of writing the asset tree")
+    output.add_argument("--check", action="store_true",
+                        help="render without writing and exit 1 if any target differs from disk")
+    return parser
+
+def stable_hash(target_name):
+    """Process- and platform-independent hash of a target name"""
+    return hashlib.sha1(target_name.encode("utf-8")).hexdigest()
+
+def list_targets(iter_targets, only=None):
+    """Enumerate a generator's target names without rendering anything
+
+    only is a list of glob patterns, as given to --only.
+    """
+    selected = select_targets(*(only or ()))
+    names = []
+    def record(target_name):
+        if selected is None or selected(target_name):
+            names.append(target_name)
+        return False
+    for _ in iter_targets(record):
+        pass
+    return sorted(names)
+
+def load_timings(path=TIMINGS_PATH):
+    """Read per-target render seconds from a previous build"""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_timings(timings, path=TIMINGS_PATH):
+    """Merge new render seconds into the timings file"""
+    merged = load_timings(path)
+    merged.update(timings)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(merged, f, indent=1, sort_keys=True)
+
+def assign_shards(targets, count, costs=None):
+    """Map every target to a shard index in 1..count, balancing total cost"""
+    costs = costs or {}
+    known = sorted(costs[name] for name in targets if name in costs)
+    # Unseen targets are assumed to be typical
+    default_cost = known[len(known) // 2] if known else 1.0
+
+    loads = [0.0] * count
+    assignment = {}
+    for name in sorted(targets, key=lambda name: (-costs.get(name, default_cost), stable_hash(name))):
+        shard = min(range(count), key=lambda index: (loads[index], index))
+        loads[shard] += costs.get(name, default_cost)
+        assignment[name] = shard + 1
+    return assignment
+
+def timed(outputs, timings):
+    """Pass outputs through, recording how long each one took to render"""
+    iterator = iter(outputs)
+    while True:
+        start = time.perf_counter()
+        try:
+            output = next(iterator)
+        except StopIteration:
+            return
+        timings[output[0]] = round(time.perf_counter() - start, 6)
+        yield output
+
+def file_digest(path):
+    """SHA-256 and size of a written output"""
+    with open(path, "rb") as f:
+        data = f.read()
+    return {"sha256": hashlib.sha256(data).hexdigest(), "bytes": len(data)}
+
+def manifest_path(manifest_dir, entry, shard):
+    """Manifest file name for one entry point run"""
+    suffix = f"shard-{shard[0]}-of-{shard[1]}" if shard else "full"
+    return os.path.join(manifest_dir, f"{entry}.{suffix}.json")
+
+def select_shard(iter_targets, shard=None, timings_path=TIMINGS_PATH, only=None):
+    """Targets for a run: returns (all_targets, assigned, include filter for the generator)"""
+    all_targets = list_targets(iter_targets, only)
+    assigned = all_targets
+    if shard:
+        assignment = assign_shards(all_targets, shard[1], load_timings(timings_path))
+        assigned = [name for name in all_targets if assignment[name] == shard[0]]
+    if shard or only:
+        return all_targets, assigned, set(assigned).__contains__
+    return all_targets, assigned, None
+
+def build(entry, iter_targets, shard=None, timings_path=TIMINGS_PATH,
+          manifest_dir=MANIFEST_DIR, out_dir=".", only=None):
+    """Render (a shard of) an entry point's targets, yielding (target_name, path, metadata)
+
+    Writes a manifest of outputs for the merge step. Unsharded runs update the
+    timings file directly; sharded runs leave that to the merge so that every
+    shard keeps using the same cost weights. only restricts the build to
+    targets matching its glob patterns; every shard must be given the same.
+    """
+    all_targets, assigned, include = select_shard(iter_targets, shard, timings_path, only)
+
+    timings = {}
+    outputs = {}
+    for target_name, path, metadata in write_to_disk(timed(iter_targets(include), timings), out_dir):
+        outputs[target_name] = file_digest(path)
+        yield target_name, path, metadata
+
+    if not shard:
+        save_timings(timings, timings_path)
+
+    os.makedirs(manifest_dir, exist_ok=True)
+    with open(manifest_path(manifest_dir, entry, shard), "w", encoding="utf-8") as f:
+        json.dump({
+            "entry": entry,
+            "shard": list(shard) if shard else None,
+            "all_targets": all_targets,
+            "assigned": assigned,
+            "outputs": outputs,
+            "timings": timings,
+        }, f, indent=1, sort_keys=True)
+
+def zip_or_check(iter_targets, args, out_dir="."):
+    """Handle --zip or --check for an entry point instead of a build; returns an exit code"""
+    _, assigned, include = select_shard(iter_targets, args.shard, args.timings, args.only)
+    if args.zip:
+        written = write_zip(iter_targets(include), args.zip)
+        print(f"📦 Bundled {len(written)} targets into {args.zip}")
+        return 0
+
+    differences = list(diff_against_disk(iter_targets(include), out_dir))
+    if differences:
+        for target_name, status in differences:
+            print(f"   • {target_name}: {status}")
+        print(f"❌ {len(differences)} of {len(assigned)} targets differ from disk")
+        return 1
+    print(f"✅ All {len(assigned)} targets match disk")
+    return 0
+
+def merge_manifests(paths):
+    """Combine shard manifests, returning (merged, problems)"""
+    manifests = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            manifests.append(json.load(f))
+    if not manifests:
+        return None, ["no manifests given"]
+
+    problems = []
+    first = manifests[0]
+    entry, all_targets = first["entry"], first["all_targets"]
+    count = first["shard"][1] if first["shard"] else 1
+
+    seen_shards = set()
+    outputs, timings = {}, {}
+    for manifest in manifests:
+        shard = tuple(manifest["shard"]) if manifest["shard"] else (1, 1)
+        if manifest["entry"] != entry or shard[1] != count:
+            problems.append(f"manifest for {manifest['entry']} shard {shard} does not belong to this build")
+            continue
+        if manifest["all_targets"] != all_targets:
+            problems.append(f"shard {shard[0]}/{count} enumerated a different target list")
+        if shard in seen_shards:
+            problems.append(f"shard {shard[0]}/{count} given twice")
+        seen_shards.add(shard)
+
+        missing = sorted(set(manifest["assigned"]) - set(manifest["outputs"]))
+        if missing:
+            problems.append(f"shard {shard[0]}/{count} did not produce: {', '.join(missing)}")
+        for target_name, digest in manifest["outputs"].items():
+            if target_name in outputs:
+                problems.append(f"{target_name} rendered by more than one shard")
+            outputs[target_name] = digest
+        timings.update(manifest["timings"])
+
+    for index in range(1, count + 1):
+        if (index, count) not in seen_shards:
+            problems.append(f"shard {index}/{count} manifest missing")
+
+    uncovered = sorted(set(all_targets) - set(outputs))
+    if uncovered:
+        problems.append(f"targets not covered by any shard: {', '.join(uncovered)}")
+
+    merged = {
+        "entry": entry,
+        "shard": None,
+        "all_targets": all_targets,
+        "assigned": all_targets,
+        "outputs": dict(sorted(outputs.items())),
+        "timings": timings,
+    }
+    return merged, problems
+
+def merge_command(args):
+    """Merge per-shard manifests and verify full coverage"""
+    paths = sorted(path for pattern in args.manifests for path in glob.glob(pattern))
+    merged, problems = merge_manifests(paths)
+    if merged is None:
+        print(f"❌ {problems[0]}")
+        return 1
+
+    print(f"🧩 Merging {len(paths)} manifests for {merged['entry']}")
+    if problems:
+        for problem in problems:
+            print(f"   • {problem}")
+        print("❌ Incomplete build")
+        return 1
+
+    with open(manifest_path(args.manifest_dir, merged["entry"], None), "w", encoding="utf-8") as f:
+        json.dump(merged, f, indent=1, sort_keys=True)
+    save_timings(merged["timings"], args.timings)
+    print(f"✅ All {len(merged['all_targets'])} targets covered; timings saved to {args.timings}")
+    return 0
+
+def local_command(args):
+    """Run N shards of an entry point as local processes, then merge"""
+    script = f"{args.entry}.py"
+    start = time.perf_counter()
+    processes = [
+        subprocess.Popen([sys.executable, script, "--shard", f"{index}/{args.shards}",
+                          "--timings", args.timings, "--manifest-dir", args.manifest_dir,
+                          *(option for pattern in args.only or () for option in ("--only", pattern))],
+                         stdout=subprocess.DEVNULL)
+        for index in range(1, args.shards + 1)
+    ]
+    failed = [index + 1 for index, process in enumerate(processes) if process.wait() != 0]
+    print(f"⏱️  {args.shards} shards finished in {time.perf_counter() - start:.2f} s")
+    if failed:
+        print(f"❌ Shards failed: {failed}")
+        return 1
+
+    args.manifests = [os.path.join(args.manifest_dir, f"{args.entry}.shard-*-of-{args.shards}.json")]
+    return merge_command(args)
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded LumiChat asset builds")
+    parser.add_argument("--timings", default=TIMINGS_PATH)
+    parser.add_argument("--manifest-dir", default=MANIFEST_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    merge = commands.add_parser("merge", help="combine shard manifests and verify coverage")
+    merge.add_argument("manifests", nargs="+", help="manifest files or glob patterns")
+    merge.set_defaults(func=merge_command)
+
+    local = commands.add_parser("local", help="run N shards as local processes")
+    local.add_argument("entry", help="entry point module, e.g. create_premium_logo_v2")
+    local.add_argument("--shards", type=int, default=os.cpu_count() or 2)
+    local.add_argument("--only", action="append", metavar="PATTERN",
+                       help="only render targets matching this glob (repeatable)")
+    local.set_defaults(func=local_command)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+if __name__ == "__main__":
+    exit(main())
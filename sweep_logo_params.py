@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+LumiChat Logo Parameter Sweep
+Renders every combination of premium logo parameters on a process pool and
+assembles labelled contact sheets
+
+    python sweep_logo_params.py --gradient-steps 10:60:10 --rays 4,6,8 --palette blue,teal
+    python sweep_logo_params.py --shadow-layers 0:3 --saturation 1.0,1.5,2.0 --lightness=-0.1,0,0.1
+
+Variants are grouped so that each worker renders runs of variants that share
+a background and shadow layers, which then come from its layer cache.
+"""
+
+from PIL import Image, ImageDraw, ImageFont
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from create_premium_logo_v2 import (GRADIENT_STEPS, PREMIUM_COLORS, PREMIUM_SHADOW_LAYERS, RAY_ANGLES,
+                                    create_premium_lumichat_logo, ray_angles)
+from layer_cache import LAYER_CACHE
+from logo_color_fixer import THEME_PRIMARY, THEME_SECONDARY, hsl_to_rgb, recolor_to_theme, rgb_to_hsl
+from pixel_buffer import as_image
+import argparse
+import itertools
+import json
+import os
+import time
+
+OUTPUT_DIR = "sweeps"
+
+def shift_palette(colors, target):
+    """Move every palette color to the hue of target, keeping its lightness and saturation"""
+    target_hue = rgb_to_hsl(*target)[0]
+    shifted = {}
+    for name, color in colors.items():
+        h, l, s = rgb_to_hsl(*color[:3])
+        shifted[name] = (*hsl_to_rgb(target_hue, l, s), *color[3:])
+    return shifted
+
+PALETTES = {
+    'blue': PREMIUM_COLORS,
+    'teal': shift_palette(PREMIUM_COLORS, THEME_PRIMARY),
+    'purple': shift_palette(PREMIUM_COLORS, THEME_SECONDARY),
+}
+
+# Swept parameter -> (label prefix, shipped value)
+PARAMETERS = {
+    'palette': ('', 'blue'),
+    'gradient_steps': ('g', GRADIENT_STEPS),
+    'rays': ('r', len(RAY_ANGLES)),
+    'shadow_layers': ('s', len(PREMIUM_SHADOW_LAYERS)),
+    'saturation_boost': ('sat', None),
+    'lightness_adjust': ('l', None),
+}
+
+def parse_values(cast):
+    """argparse type for 'a,b,c' lists and inclusive 'start:stop[:step]' ranges"""
+    def parse(text):
+        if ":" not in text:
+            return [cast(part) for part in text.split(",")]
+        parts = [float(part) for part in text.split(":")]
+        if len(parts) not in (2, 3):
+            raise argparse.ArgumentTypeError(f"range must look like start:stop[:step], got {text!r}")
+        start, stop = parts[:2]
+        step = parts[2] if len(parts) == 3 else 1
+        if step <= 0:
+            raise argparse.ArgumentTypeError(f"range step must be positive, got {text!r}")
+        count = int(round((stop - start) / step)) + 1
+        return [cast(round(start + index * step, 6)) for index in range(max(0, count))]
+    return parse
+
+def variant_grid(ranges):
+    """Every combination of the swept values, ordered so shared layers are adjacent"""
+    # Palette and gradient steps vary slowest: the background layer depends only on them
+    names = list(PARAMETERS)
+    values = [ranges.get(name) or [PARAMETERS[name][1]] for name in names]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+def variant_label(variant, swept):
+    """Short label naming only the swept parameters"""
+    parts = []
+    for name in swept:
+        prefix, _ = PARAMETERS[name]
+        value = variant[name]
+        parts.append(f"{prefix}{value:g}" if isinstance(value, float) else f"{prefix}{value}")
+    return " ".join(parts) or "shipped"
+
+def render_variant(variant, size):
+    """Render one variant of the premium logo"""
+    colors = PALETTES[variant['palette']]
+    img = create_premium_lumichat_logo(
+        size,
+        gradient_steps=variant['gradient_steps'],
+        rays=ray_angles(variant['rays']),
+        shadow_layers=PREMIUM_SHADOW_LAYERS[:variant['shadow_layers']],
+        colors=colors,
+    )
+    if variant['saturation_boost'] is not None or variant['lightness_adjust'] is not None:
+        theme_hue = rgb_to_hsl(*colors['primary'])[0]
+        saturation = variant['saturation_boost'] if variant['saturation_boost'] is not None else 1.5
+        recolor_to_theme(img, theme_hue, saturation, variant['lightness_adjust'] or 0)
+    return img
+
+def render_chunk(indexed_variants, size):
+    """Worker task: render a run of variants, timing each one"""
+    results = []
+    for index, variant in indexed_variants:
+        start = time.perf_counter()
+        img = render_variant(variant, size)
+        results.append((index, as_image(img), time.perf_counter() - start))
+    return os.getpid(), results, LAYER_CACHE.stats()
+
+def run_sweep(variants, size, workers=None):
+    """Render all variants on a process pool, returning images, seconds per variant and cache stats"""
+    workers = workers or os.cpu_count() or 1
+    indexed = list(enumerate(variants))
+    # Contiguous chunks keep variants that share layers on the same worker
+    chunk_count = min(len(indexed), workers * 4)
+    chunk_size = -(-len(indexed) // chunk_count) if chunk_count else 1
+
+    images = [None] * len(variants)
+    seconds = [0.0] * len(variants)
+    cache_stats = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(render_chunk, indexed[start:start + chunk_size], size)
+                   for start in range(0, len(indexed), chunk_size)]
+        for future in as_completed(futures):
+            pid, results, stats = future.result()
+            for index, img, elapsed in results:
+                images[index] = img
+                seconds[index] = elapsed
+            # Counters are cumulative per worker process
+            previous = cache_stats.get(pid)
+            if previous is None or stats['hits'] + stats['misses'] > previous['hits'] + previous['misses']:
+                cache_stats[pid] = stats
+    return images, seconds, cache_stats
+
+def contact_sheets(images, labels, columns=8, rows=8, background=(255, 255, 255)):
+    """Lay images out in labelled grids, one sheet per columns x rows variants"""
+    font = ImageFont.load_default()
+    tile = images[0].width
+    label_height = 14
+    per_sheet = columns * rows
+    sheets = []
+    for first in range(0, len(images), per_sheet):
+        batch = list(zip(images[first:first + per_sheet], labels[first:first + per_sheet]))
+        sheet_columns = min(columns, len(batch))
+        sheet_rows = -(-len(batch) // columns)
+        sheet = Image.new('RGB', (sheet_columns * tile, sheet_rows * (tile + label_height)), background)
+        draw = ImageDraw.Draw(sheet)
+        for position, (img, label) in enumerate(batch):
+            x = position % columns * tile
+            y = position // columns * (tile + label_height)
+            sheet.paste(img, (x, y), img)
+            draw.text((x + 2, y + tile + 1), label, fill=(15, 23, 42), font=font)
+        sheets.append(sheet)
+    return sheets
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep premium logo parameters into contact sheets")
+    parser.add_argument("--palette", type=parse_values(str), help=f"palettes: {', '.join(PALETTES)}")
+    parser.add_argument("--gradient-steps", type=parse_values(int))
+    parser.add_argument("--rays", type=parse_values(int), help="number of evenly spaced rays")
+    parser.add_argument("--shadow-layers", type=parse_values(int),
+                        help=f"how many of the {len(PREMIUM_SHADOW_LAYERS)} drop shadows to draw")
+    parser.add_argument("--saturation", type=parse_values(float), dest="saturation_boost",
+                        help="theme recolor saturation_boost")
+    parser.add_argument("--lightness", type=parse_values(float), dest="lightness_adjust",
+                        help="theme recolor lightness_adjust (write --lightness=-0.1,0 for negatives)")
+    parser.add_argument("--size", type=int, default=192, help="tile size in pixels")
+    parser.add_argument("--columns", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out-dir", default=OUTPUT_DIR)
+    args = parser.parse_args()
+
+    ranges = {name: getattr(args, name) for name in PARAMETERS if getattr(args, name)}
+    unknown = [name for name in ranges.get('palette', []) if name not in PALETTES]
+    if unknown:
+        parser.error(f"unknown palette: {', '.join(unknown)}")
+    if any(count < 1 for count in ranges.get('rays', [])):
+        parser.error("--rays values must be at least 1")
+    if any(not 0 <= count <= len(PREMIUM_SHADOW_LAYERS) for count in ranges.get('shadow_layers', [])):
+        parser.error(f"--shadow-layers values must be between 0 and {len(PREMIUM_SHADOW_LAYERS)}")
+    swept = [name for name in PARAMETERS if len(ranges.get(name, [])) > 1]
+
+    variants = variant_grid(ranges)
+    print("🎛️  LumiChat Logo Parameter Sweep")
+    print(f"   {len(variants)} variants @ {args.size}x{args.size}"
+          f" ({' × '.join(f'{len(ranges[name])} {name}' for name in swept) or 'shipped design'})")
+    print()
+
+    start = time.perf_counter()
+    images, seconds, cache_stats = run_sweep(variants, args.size, args.workers)
+    render_wall = time.perf_counter() - start
+
+    labels = [variant_label(variant, swept) for variant in variants]
+    os.makedirs(args.out_dir, exist_ok=True)
+    sheets = contact_sheets(images, labels, args.columns, args.rows)
+    for number, sheet in enumerate(sheets, 1):
+        path = os.path.join(args.out_dir, f"sweep_{number:03d}.png")
+        sheet.save(path, "PNG")
+        print(f"✓ {path}")
+
+    with open(os.path.join(args.out_dir, "sweep.json"), "w", encoding="utf-8") as f:
+        json.dump([{"label": label, "params": variant, "seconds": round(elapsed, 6)}
+                   for label, variant, elapsed in zip(labels, variants, seconds)], f, indent=1)
+
+    ranked = sorted(seconds)
+    hits = sum(stats['hits'] for stats in cache_stats.values())
+    misses = sum(stats['misses'] for stats in cache_stats.values())
+    print()
+    print(f"⏱️  {len(variants)} variants in {render_wall:.2f} s on {len(cache_stats)} worker(s) "
+          f"({len(variants) / render_wall:.0f} variants/s), total {time.perf_counter() - start:.2f} s with sheets")
+    print(f"⏱️  Per variant: {sum(seconds) / len(seconds) * 1000:.1f} ms avg, "
+          f"{ranked[len(ranked) // 2] * 1000:.1f} ms median, {ranked[-1] * 1000:.1f} ms max")
+    slowest = max(range(len(variants)), key=seconds.__getitem__)
+    print(f"   • slowest: {labels[slowest]}")
+    if hits + misses:
+        print(f"🧱 Layer cache across workers: {hits} hits, {misses} misses "
+              f"({hits / (hits + misses) * 100:.0f}% hit rate)")
+
+if __name__ == "__main__":
+    main()